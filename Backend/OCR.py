@@ -1,29 +1,194 @@
 
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
+from concurrent.futures import ProcessPoolExecutor
 import pytesseract
+import os
 import re
+import subprocess
+import threading
+import time
+
+# Size of the tesseract process pool shared by all documents (1 = serial, in-process)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", os.cpu_count() or 1))
+
+# Rasterization settings; at most OCR_MAX_RESIDENT_PAGES page images per document
+# are in memory at once (a fixed cap, not scaled with the core count: a 300 DPI
+# A4 page is ~25 MB as an RGB image)
+OCR_DPI = 300
+OCR_MAX_RESIDENT_PAGES = int(os.getenv("OCR_MAX_RESIDENT_PAGES", 4))
+
+# Born-digital pages: use the embedded text layer when it looks like real text
+OCR_USE_TEXT_LAYER = os.getenv("OCR_USE_TEXT_LAYER", "1") == "1"
+MIN_TEXT_LAYER_CHARS = 40
+MIN_TEXT_LAYER_ALNUM_RATIO = 0.6
+
+
+# Normalization applied to every page, in order
+NORMALIZE_PATTERNS = [
+    (r'[_]{3,}', '[VALUE]'),
+    (r'\.\.\.+', '[VALUE]'),
+    (r'[ \t]+', " "),
+]
+
+
+def ocr_settings():
+    """
+    Settings that affect OCR output (used to key cached results)
+    """
+    return {
+        "dpi": OCR_DPI,
+        "normalize_patterns": NORMALIZE_PATTERNS,
+        "use_text_layer": OCR_USE_TEXT_LAYER,
+        "min_text_layer_chars": MIN_TEXT_LAYER_CHARS,
+        "min_text_layer_alnum_ratio": MIN_TEXT_LAYER_ALNUM_RATIO,
+    }
+
+
+def _clean_page_text(page_text):
+    for pattern, replacement in NORMALIZE_PATTERNS:
+        page_text = re.sub(pattern, replacement, page_text)
+    return page_text
+
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+def page_pool():
+    """
+    The process pool every document's pages are OCR'd on, created on first
+    use so each upload does not pay process startup. None when OCR_WORKERS is 1.
+    """
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None and OCR_WORKERS > 1:
+            _page_pool = ProcessPoolExecutor(max_workers=OCR_WORKERS)
+        return _page_pool
+
+
+def shutdown_page_pool():
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is not None:
+            _page_pool.shutdown(wait=False, cancel_futures=True)
+            _page_pool = None
+
+
+def _ocr_page(page):
+    """
+    OCR a single page image (runs inside a pool worker)
+    """
+    start = time.perf_counter()
+    page_text = _clean_page_text(pytesseract.image_to_string(page))
+    return page_text, time.perf_counter() - start
 
-def ocr_pdf(pdf_path):
-    pages = convert_from_path(pdf_path, dpi=300)
-    full_text = "-----AUTO LOAN CONTRACT-----\n\n"
 
-    for i, page in enumerate(pages):
-        page_text = pytesseract.image_to_string(page)
+def extract_text_layer(pdf_path):
+    """
+    Return the embedded text of each page (via poppler's pdftotext),
+    or an empty list when the PDF has no text layer or pdftotext is unavailable
+    """
+    try:
+        result = subprocess.run(
+            ["pdftotext", "-enc", "UTF-8", pdf_path, "-"],
+            capture_output=True, check=True, timeout=60
+        )
+    except (OSError, subprocess.SubprocessError):
+        return []
+
+    # pdftotext ends every page with a form feed
+    return result.stdout.decode("utf-8", errors="ignore").split("\f")[:-1]
+
+
+def _is_usable_text(page_text):
+    """
+    A page's text layer is usable if it has enough characters and is mostly
+    letters/digits (scanned pages often carry an empty or garbage layer)
+    """
+    chars = [c for c in page_text if not c.isspace()]
+    if len(chars) < MIN_TEXT_LAYER_CHARS:
+        return False
+    alnum = sum(1 for c in chars if c.isalnum())
+    return alnum / len(chars) >= MIN_TEXT_LAYER_ALNUM_RATIO
+
+
+def iter_page_windows(pdf_path, page_numbers, window=None, dpi=OCR_DPI):
+    """
+    Rasterize the given pages a few at a time.
+    Yields ([page_numbers], [images]) windows of at most `window` consecutive
+    pages, so the caller can OCR and release each window before the next is rendered.
+    """
+    window = max(1, window or OCR_MAX_RESIDENT_PAGES)
+
+    run = []
+    for number in list(page_numbers) + [None]:
+        if run and (number is None or number != run[-1] + 1 or len(run) == window):
+            yield run, convert_from_path(pdf_path, dpi=dpi, first_page=run[0], last_page=run[-1])
+            run = []
+        if number is not None:
+            run.append(number)
+
+
+def ocr_pdf_with_timings(pdf_path, workers=None, max_resident_pages=None):
+    """
+    OCR a PDF and return (text, per-page timings).
+    Pages with a usable text layer are read directly; the rest are rasterized
+    in bounded windows, spread across the shared page pool and re-assembled in
+    page order. workers=1 OCRs this document serially, in-process.
+    """
+    workers = workers or OCR_WORKERS
+    max_resident_pages = max_resident_pages or OCR_MAX_RESIDENT_PAGES
+
+    page_count = pdfinfo_from_path(pdf_path)["Pages"]
+    text_layer = extract_text_layer(pdf_path) if OCR_USE_TEXT_LAYER else []
+
+    page_texts = {}
+    timings = {}
+
+    for number, native_text in enumerate(text_layer[:page_count], start=1):
+        if _is_usable_text(native_text):
+            start = time.perf_counter()
+            page_texts[number] = _clean_page_text(native_text)
+            timings[number] = ("text_layer", time.perf_counter() - start)
+
+    scanned_pages = [n for n in range(1, page_count + 1) if n not in page_texts]
+
+    pool = page_pool() if workers > 1 and len(scanned_pages) > 1 else None
+    for numbers, pages in iter_page_windows(pdf_path, scanned_pages, max_resident_pages):
+        if pool and len(pages) > 1:
+            results = list(pool.map(_ocr_page, pages))
+        else:
+            results = [_ocr_page(page) for page in pages]
+
+        # Release this window's images before rendering the next one
+        del pages
+
+        for number, (page_text, seconds) in zip(numbers, results):
+            page_texts[number] = page_text
+            timings[number] = ("ocr", seconds)
+
+    full_text = "-----AUTO LOAN CONTRACT-----\n\n"
+    page_timings = []
 
-        page_text = re.sub(r'[_]{3,}', '[VALUE]', page_text)
-        page_text = re.sub(r'\.\.\.+', '[VALUE]', page_text)
+    for number in range(1, page_count + 1):
+        full_text += f"[Page {number}]\n{page_texts[number]}\n\n"
+        source, seconds = timings[number]
+        page_timings.append({"page": number, "source": source, "seconds": round(seconds, 3)})
 
-        page_text = re.sub(r'[ \t]+', " ", page_text)
+    return full_text, page_timings
 
-        full_text += f"[Page {i+1}]\n{page_text}\n\n"
 
-    return full_text
+def ocr_pdf(pdf_path, workers=None, max_resident_pages=None):
+    text, _ = ocr_pdf_with_timings(pdf_path, workers, max_resident_pages)
+    return text
 
 if __name__ == "__main__":
-    pdf_path = "Sample_contract.pdf"  
-    text = ocr_pdf(pdf_path)
+    pdf_path = "Sample_contract.pdf"
+    text, timings = ocr_pdf_with_timings(pdf_path)
 
     with open("test_output.txt", "w", encoding="utf-8") as f:
         f.write(text)
 
+    for t in timings:
+        print(f"Page {t['page']} ({t['source']}): {t['seconds']}s")
     print("OCR completed. Output saved as test_output.txt")
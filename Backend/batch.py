@@ -0,0 +1,273 @@
+"""
+Batch contract analysis for portfolio-scale review.
+
+Usage:
+    python batch.py contracts/ results.jsonl
+    python batch.py manifest.txt results.parquet --ocr-workers 2 --llm-workers 8
+
+The input is a directory (searched recursively for PDFs) or a manifest file
+with one PDF path per line (.txt) or {"path": ...} per line (.jsonl).
+Results are appended to a JSONL file as each contract finishes, so an
+interrupted run picks up where it left off. A .parquet output is written
+from that JSONL checkpoint once the run completes.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from OCR import ocr_pdf_with_timings, ocr_settings
+from ocr_cache import OCRCache
+from llm_engine import extract_sla_fields
+from Score import calculate_fairness_score
+from vehicle_details import extract_vin_and_vehicle_details
+
+# =========================
+# CONFIG
+# =========================
+
+BATCH_OCR_WORKERS = int(os.getenv("BATCH_OCR_WORKERS", 2))
+BATCH_LLM_WORKERS = int(os.getenv("BATCH_LLM_WORKERS", 8))
+BATCH_IO_WORKERS = int(os.getenv("BATCH_IO_WORKERS", 8))
+
+
+# =========================
+# INPUT / CHECKPOINT
+# =========================
+
+def _inside(path: str, root: str) -> str:
+    """path resolved (symlinks included); ValueError if it is outside root"""
+    resolved = os.path.realpath(path)
+    if root is not None and os.path.commonpath([resolved, root]) != root:
+        raise ValueError(f"PDF path outside the batch root: {path}")
+    return resolved
+
+
+def discover_pdfs(source: str, root: str = None):
+    """
+    List PDFs from a directory or a manifest file. With root set, every
+    PDF (absolute or ../ manifest entries, symlinked files) must resolve
+    inside it, else ValueError.
+    """
+    root = os.path.realpath(root) if root is not None else None
+
+    if os.path.isdir(source):
+        paths = []
+        for dirpath, _, files in os.walk(source):
+            paths.extend(_inside(os.path.join(dirpath, name), root)
+                         for name in files if name.lower().endswith(".pdf"))
+        return sorted(paths)
+
+    base = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = json.loads(line)["path"] if line.startswith("{") else line
+            paths.append(_inside(os.path.join(base, path), root))
+    return paths
+
+
+def _checkpoint_path(output: str):
+    return output + ".jsonl" if output.endswith(".parquet") else output
+
+
+def latest_records(checkpoint: str):
+    """
+    path -> last record written for it. A resumed run appends a new record
+    after an earlier error, so only the last one per path counts.
+    """
+    records = {}
+    if not os.path.exists(checkpoint):
+        return records
+
+    with open(checkpoint, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # partial line from an interrupted run
+            records.pop(record["path"], None)
+            records[record["path"]] = record
+    return records
+
+
+def load_completed(checkpoint: str):
+    """(path, sha256) pairs whose last record is a success"""
+    return {
+        (record["path"], record["sha256"])
+        for record in latest_records(checkpoint).values()
+        if record.get("status") == "ok"
+    }
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_parquet(checkpoint: str, output: str):
+    """
+    Convert the JSONL checkpoint to Parquet, one row per path (its last
+    record), nested fields stored as JSON strings
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = []
+    columns = {}  # union of keys over all rows, in first-seen order
+    for record in latest_records(checkpoint).values():
+        rows.append({
+            key: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+            for key, value in record.items()
+        })
+        columns.update(dict.fromkeys(record))
+
+    # ok and error rows have different keys; from_pylist would take the
+    # columns of the first row only, so give every row every column
+    table = pa.Table.from_pylist([{column: row.get(column) for column in columns} for row in rows])
+    pq.write_table(table, output)
+
+
+# =========================
+# PIPELINE
+# =========================
+
+def run_batch(source: str, output: str, ocr_workers=BATCH_OCR_WORKERS,
+              llm_workers=BATCH_LLM_WORKERS, io_workers=BATCH_IO_WORKERS,
+              ocr_cache=None, on_progress=None, root=None):
+    """
+    OCR → SLA extraction → fairness score, with the VIN decode running
+    alongside extraction. Each stage has its own pool, so different contracts
+    are in different stages at the same time. root confines the input PDFs
+    (see discover_pdfs). The returned ok/errors counts are the final status
+    of each input PDF (its last checkpoint record), resumed runs included.
+    """
+    checkpoint = _checkpoint_path(output)
+    ocr_cache = ocr_cache or OCRCache()
+
+    paths = discover_pdfs(source, root)
+    completed = load_completed(checkpoint)
+
+    write_lock = threading.Lock()
+    counts = {"ok": 0, "error": 0}
+    start = time.perf_counter()
+
+    def write(record):
+        with write_lock:
+            with open(checkpoint, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            counts[record["status"]] += 1
+            if on_progress:
+                on_progress(_summary(len(paths), skipped, counts, start))
+
+    pending = []
+    skipped = 0
+    for path in paths:
+        try:
+            sha = _sha256(path)
+        except OSError as e:
+            # one unreadable PDF is an error row, not a failed batch
+            write({"path": path, "sha256": None, "status": "error", "error": str(e), "seconds": 0.0})
+            continue
+        if (path, sha) in completed:
+            skipped += 1
+        else:
+            pending.append((path, sha))
+
+    ocr_pool = ThreadPoolExecutor(max_workers=ocr_workers, thread_name_prefix="batch-ocr")
+    llm_pool = ThreadPoolExecutor(max_workers=llm_workers, thread_name_prefix="batch-llm")
+    io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="batch-io")
+
+    def ocr(path):
+        with open(path, "rb") as f:
+            key = OCRCache.make_key(f.read(), ocr_settings())
+        cached = ocr_cache.get(key)
+        if cached:
+            return cached["ocr_text"]
+        ocr_text, page_timings = ocr_pdf_with_timings(path)
+        ocr_cache.put(key, {"ocr_text": ocr_text, "page_timings": page_timings})
+        return ocr_text
+
+    def process(path, sha):
+        contract_start = time.perf_counter()
+        record = {"path": path, "sha256": sha}
+        try:
+            ocr_text = ocr_pool.submit(ocr, path).result()
+            vin_future = io_pool.submit(extract_vin_and_vehicle_details, ocr_text)
+            sla_data = llm_pool.submit(extract_sla_fields, ocr_text).result()
+            vehicle_info = vin_future.result()
+
+            record.update({
+                "status": "ok",
+                "vin": vehicle_info["vin"],
+                "vehicle_details": vehicle_info["vehicle_details"],
+                "sla_extraction": sla_data,
+                "fairness_score": calculate_fairness_score(sla_data),
+            })
+        except Exception as e:
+            record.update({"status": "error", "error": str(e)})
+
+        record["seconds"] = round(time.perf_counter() - contract_start, 3)
+        write(record)
+
+    # Enough orchestrating threads to keep every stage pool busy
+    with ThreadPoolExecutor(max_workers=ocr_workers + llm_workers) as contracts:
+        list(contracts.map(lambda item: process(*item), pending))
+
+    for pool in (ocr_pool, llm_pool, io_pool):
+        pool.shutdown()
+
+    if output.endswith(".parquet"):
+        write_parquet(checkpoint, output)
+
+    latest = latest_records(checkpoint)
+    final = {"ok": 0, "error": 0}
+    for path in paths:
+        if path in latest:
+            final[latest[path]["status"]] += 1
+    return _summary(len(paths), skipped, counts, start, final)
+
+
+def _summary(total, skipped, counts, start, final=None):
+    """counts are this run's records; final (if given) the last status per path"""
+    elapsed = time.perf_counter() - start
+    processed = counts["ok"] + counts["error"]
+    final = final or counts
+    return {
+        "total": total,
+        "skipped_already_done": skipped,
+        "processed": processed,
+        "ok": final["ok"],
+        "errors": final["error"],
+        "elapsed_seconds": round(elapsed, 1),
+        "contracts_per_minute": round(60 * processed / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Analyze a portfolio of contract PDFs")
+    parser.add_argument("source", help="directory of PDFs or manifest file (.txt / .jsonl)")
+    parser.add_argument("output", help="results file (.jsonl or .parquet)")
+    parser.add_argument("--ocr-workers", type=int, default=BATCH_OCR_WORKERS)
+    parser.add_argument("--llm-workers", type=int, default=BATCH_LLM_WORKERS)
+    parser.add_argument("--io-workers", type=int, default=BATCH_IO_WORKERS)
+    args = parser.parse_args()
+
+    def report(progress):
+        print(f"{progress['processed']} done ({progress['errors']} errors), "
+              f"{progress['contracts_per_minute']} contracts/min", flush=True)
+
+    summary = run_batch(args.source, args.output, args.ocr_workers,
+                        args.llm_workers, args.io_workers, on_progress=report)
+    print(json.dumps(summary, indent=2))
@@ -0,0 +1,200 @@
+import os
+import re
+
+# =========================
+# CONFIG
+# =========================
+
+# Approximate token budget for the contract text sent to SLA extraction
+SLA_PROMPT_TOKEN_BUDGET = int(os.getenv("SLA_PROMPT_TOKEN_BUDGET", 2000))
+
+# Consecutive paragraphs on a page are merged up to this size
+CHUNK_MAX_CHARS = 600
+
+PAGE_MARKER = re.compile(r"\[Page (\d+)\]")
+
+# Keyword/regex index per SLA field
+SLA_FIELD_PATTERNS = {
+    "interest_rate_apr": [
+        r"\binterest\b", r"\bapr\b", r"rate of interest", r"per annum", r"\d+(\.\d+)?\s*%"
+    ],
+    "late_fee_penalty": [
+        r"\blate\b", r"\bpenal(ty|ties)?\b", r"\boverdue\b", r"\bdelay(ed)?\b", r"\bdishono(u)?r\b"
+    ],
+    "termination_clause": [
+        r"\bterminat(e|ion)\b", r"\bforeclos(e|ure)\b", r"\bprepayment\b", r"\bearly (settlement|closure)\b"
+    ],
+    "down_payment": [
+        r"\bdown ?payment\b", r"\bmargin money\b", r"\badvance\b", r"\btrade-?in\b"
+    ],
+    "emi_amount": [
+        r"\bemi\b", r"\binstal(l)?ment\b", r"\bmonthly (payment|emi)\b", r"\btenure\b"
+    ],
+    "insurance_mandatory": [
+        r"\binsurance\b", r"\bpolicy\b", r"\bpremium\b", r"\bcomprehensive\b"
+    ],
+    "processing_fees": [
+        r"\bprocessing\b", r"\bfee(s)?\b", r"\bcharges?\b", r"\bdocumentation\b"
+    ],
+}
+
+_COMPILED_PATTERNS = {
+    field: [re.compile(p, re.IGNORECASE) for p in patterns]
+    for field, patterns in SLA_FIELD_PATTERNS.items()
+}
+
+_AMOUNT = re.compile(r"(₹|rs\.?|inr|%)\s*\d|\d[\d,]*(\.\d+)?\s*%", re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+# =========================
+# CHUNKING
+# =========================
+
+def _pieces(paragraph: str, max_chars: int):
+    """
+    Cut a paragraph longer than max_chars at whitespace (hard cut if a single
+    word is longer). OCR text without blank lines is one huge paragraph.
+    """
+    while len(paragraph) > max_chars:
+        cut = paragraph.rfind(" ", 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        yield paragraph[:cut].strip()
+        paragraph = paragraph[cut:].strip()
+    if paragraph:
+        yield paragraph
+
+
+def split_chunks(ocr_text: str, max_chars: int = CHUNK_MAX_CHARS):
+    """
+    Split OCR output into page-tagged chunks of merged paragraphs, each at
+    most max_chars long
+    """
+    chunks = []
+    parts = PAGE_MARKER.split(ocr_text)
+
+    # parts = [preamble, page_no, page_text, page_no, page_text, ...]
+    for i in range(1, len(parts), 2):
+        page = int(parts[i])
+        current = ""
+        paragraphs = re.split(r"\n\s*\n", parts[i + 1])
+        for paragraph in (piece for p in paragraphs for piece in _pieces(p.strip(), max_chars)):
+            if current and len(current) + len(paragraph) + 1 > max_chars:
+                chunks.append({"page": page, "text": current})
+                current = ""
+            current = f"{current}\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append({"page": page, "text": current})
+
+    return chunks
+
+
+def _score_chunk(text: str, fields):
+    """Return (score, fields matched) for a chunk"""
+    field_hits = {}
+    for field in fields:
+        patterns = _COMPILED_PATTERNS[field]
+        hits = sum(len(p.findall(text)) for p in patterns)
+        if hits:
+            field_hits[field] = hits
+
+    # Diminishing returns per field; chunks with concrete amounts rank higher
+    score = sum(min(hits, 3) for hits in field_hits.values())
+    if score and _AMOUNT.search(text):
+        score *= 1.5
+    return score, field_hits
+
+
+# =========================
+# SELECTION
+# =========================
+
+def select_relevant_chunks(ocr_text: str, token_budget: int = None, fields=None):
+    """
+    Keep only the chunks most relevant to the SLA fields (all of them, or just
+    `fields`), within token_budget.
+    The best chunk for each field is taken first so every field stays covered,
+    then the remaining budget goes to the highest-scoring chunks.
+    Chunks are emitted in document order under their [Page N] markers.
+    If nothing fits or nothing scores, the original text truncated to the
+    budget is returned instead, so the prompt never loses its contract text.
+
+    Returns (selected_text, report).
+    """
+    token_budget = token_budget or SLA_PROMPT_TOKEN_BUDGET
+    fields = fields or list(SLA_FIELD_PATTERNS)
+    original_tokens = estimate_tokens(ocr_text)
+    budget_chars = 4 * (token_budget - 1)
+    chunks = split_chunks(ocr_text, max(1, min(CHUNK_MAX_CHARS, budget_chars)))
+
+    if original_tokens <= token_budget or not chunks:
+        return ocr_text, {
+            "original_tokens": original_tokens,
+            "selected_tokens": original_tokens,
+            "reduction_pct": 0.0,
+            "chunks_total": len(chunks),
+            "chunks_selected": len(chunks),
+        }
+
+    scored = []
+    for index, chunk in enumerate(chunks):
+        score, field_hits = _score_chunk(chunk["text"], fields)
+        if score:
+            scored.append((score, index, field_hits))
+
+    ranked = sorted(scored, key=lambda item: (-item[0], item[1]))
+
+    best_per_field = []
+    for field in fields:
+        for score, index, field_hits in ranked:
+            if field in field_hits:
+                best_per_field.append(index)
+                break
+
+    selected = set()
+    used_tokens = 0
+    for index in best_per_field + [index for _, index, _ in ranked]:
+        if index in selected:
+            continue
+        cost = estimate_tokens(chunks[index]["text"])
+        if used_tokens + cost > token_budget:
+            continue
+        selected.add(index)
+        used_tokens += cost
+
+    lines = []
+    current_page = None
+    for index in sorted(selected):
+        chunk = chunks[index]
+        if chunk["page"] != current_page:
+            current_page = chunk["page"]
+            lines.append(f"\n[Page {current_page}]")
+        lines.append(chunk["text"])
+
+    if selected:
+        selected_text = "\n".join(lines).strip() + "\n"
+    else:
+        selected_text = ocr_text[:budget_chars]
+    selected_tokens = estimate_tokens(selected_text)
+
+    return selected_text, {
+        "original_tokens": original_tokens,
+        "selected_tokens": selected_tokens,
+        "reduction_pct": round(100 * (1 - selected_tokens / original_tokens), 1),
+        "chunks_total": len(chunks),
+        "chunks_selected": len(selected),
+    }
+
+
+if __name__ == "__main__":
+    with open("test_output.txt", "r", encoding="utf-8") as f:
+        text = f.read()
+
+    selected_text, report = select_relevant_chunks(text)
+    print(selected_text)
+    print(report)
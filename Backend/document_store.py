@@ -0,0 +1,140 @@
+import os
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# CONFIG
+# =========================
+
+DOCUMENT_TTL_SECONDS = int(os.getenv("DOCUMENT_TTL_SECONDS", 3600))
+DOCUMENT_MAX_IN_MEMORY = int(os.getenv("DOCUMENT_MAX_IN_MEMORY", 256))
+
+# Optional directory for documents pushed out of memory ("" disables spilling)
+DOCUMENT_SPILL_DIR = os.getenv("DOCUMENT_SPILL_DIR", os.path.join("runtime_data", "documents"))
+
+
+# =========================
+# PER-DOCUMENT OCR TEXT STORE
+# =========================
+
+class DocumentStore:
+    """
+    OCR text keyed by document id, so concurrent contracts never share state.
+    Entries expire after ttl_seconds; when more than max_in_memory are held,
+    the least recently used ones are spilled to disk (or dropped if spilling is off).
+    A spilled file's mtime is its original expiry time, so spilling never
+    extends a document's life. Files are written outside the lock; a failed
+    write keeps the document in memory.
+    """
+
+    def __init__(self, ttl_seconds=DOCUMENT_TTL_SECONDS,
+                 max_in_memory=DOCUMENT_MAX_IN_MEMORY, spill_dir=DOCUMENT_SPILL_DIR):
+        self.ttl_seconds = ttl_seconds
+        self.max_in_memory = max_in_memory
+        self.spill_dir = spill_dir or None
+        self._documents = OrderedDict()  # id -> (text, expires_at)
+        self._spilling = {}  # id -> (text, expires_at) while its file is written
+        self._lock = threading.Lock()
+        self._last_purge = time.time()
+
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+    def _spill_path(self, document_id):
+        return os.path.join(self.spill_dir, f"{document_id}.txt")
+
+    def put(self, text: str) -> str:
+        document_id = uuid.uuid4().hex
+        with self._lock:
+            self._documents[document_id] = (text, time.time() + self.ttl_seconds)
+            spilled = self._evict()
+        for spilled_id, entry in spilled:
+            self._spill(spilled_id, entry)
+        return document_id
+
+    def get(self, document_id: str):
+        # Ids are hex uuids; reject anything else before touching the filesystem
+        if not document_id or not all(c in "0123456789abcdef" for c in document_id):
+            return None
+
+        with self._lock:
+            if document_id in self._spilling:
+                text, expires_at = self._spilling[document_id]
+                return text if expires_at > time.time() else None
+            entry = self._documents.get(document_id)
+            if entry:
+                text, expires_at = entry
+                if expires_at > time.time():
+                    self._documents.move_to_end(document_id)
+                    return text
+                del self._documents[document_id]
+                return None
+
+        if self.spill_dir:
+            path = self._spill_path(document_id)
+            try:
+                if os.path.getmtime(path) > time.time():
+                    with open(path, "r", encoding="utf-8") as f:
+                        return f.read()
+                os.remove(path)
+            except OSError:
+                pass
+        return None
+
+    def _evict(self):
+        """Drop expired entries; return [(id, entry)] to spill (caller holds the lock)"""
+        now = time.time()
+        for document_id in [d for d, (_, exp) in self._documents.items() if exp <= now]:
+            del self._documents[document_id]
+
+        spilled = []
+        while len(self._documents) > self.max_in_memory:
+            document_id, entry = self._documents.popitem(last=False)
+            if self.spill_dir:
+                self._spilling[document_id] = entry
+                spilled.append((document_id, entry))
+
+        if self.spill_dir and now - self._last_purge > self.ttl_seconds / 10:
+            self._last_purge = now
+            self._purge_spilled(now)
+        return spilled
+
+    def _spill(self, document_id, entry):
+        text, expires_at = entry
+        path = self._spill_path(document_id)
+        try:
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(text)
+            os.utime(path + ".tmp", (expires_at, expires_at))
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            logger.warning("Could not spill document %s, keeping it in memory: %s", document_id, e)
+            with self._lock:
+                self._documents[document_id] = entry
+                self._documents.move_to_end(document_id, last=False)
+        finally:
+            with self._lock:
+                self._spilling.pop(document_id, None)
+
+    def _purge_spilled(self, now):
+        for name in os.listdir(self.spill_dir):
+            path = os.path.join(self.spill_dir, name)
+            try:
+                if os.path.getmtime(path) <= now:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_memory": len(self._documents),
+                "max_in_memory": self.max_in_memory,
+                "spill_dir": self.spill_dir,
+                "ttl_seconds": self.ttl_seconds
+            }
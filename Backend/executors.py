@@ -0,0 +1,136 @@
+import os
+import asyncio
+import functools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# =========================
+# CONCURRENCY LIMITS
+# =========================
+
+# Documents OCR'd at once (their pages share the OCR.OCR_WORKERS process pool)
+OCR_CONCURRENCY = int(os.getenv("OCR_CONCURRENCY", 2))
+
+# Gemini calls in flight at once
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", 8))
+
+# Other blocking I/O (NHTSA lookups, cache files)
+IO_CONCURRENCY = int(os.getenv("IO_CONCURRENCY", 16))
+
+ocr_executor = ThreadPoolExecutor(max_workers=OCR_CONCURRENCY, thread_name_prefix="ocr")
+llm_executor = ThreadPoolExecutor(max_workers=LLM_CONCURRENCY, thread_name_prefix="llm")
+io_executor = ThreadPoolExecutor(max_workers=IO_CONCURRENCY, thread_name_prefix="io")
+
+
+
+class SharedSlots:
+    """
+    A concurrency cap usable from threads (with) and coroutines (async with),
+    so blocking and native async Gemini calls count against the same limit.
+    Waiters queue in arrival order and a released slot is handed straight to
+    the next one: threads park on an Event, coroutines await a future on
+    their own loop, so neither polls or ties up a thread.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._free = limit
+        self._waiters = deque()  # grant callables; return False if the waiter is gone
+        self._lock = threading.Lock()
+
+    def _take_or_queue(self, grant):
+        """True if a slot was free; otherwise queue grant for the next release"""
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return True
+            self._waiters.append(grant)
+            return False
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                if self._waiters.popleft()():
+                    return
+            self._free += 1
+
+    def __enter__(self):
+        ready = threading.Event()
+
+        def grant():
+            ready.set()
+            return True
+
+        if not self._take_or_queue(grant):
+            ready.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def grant():
+            try:
+                loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+            except RuntimeError:  # loop closed
+                return False
+            return True
+
+        if self._take_or_queue(grant):
+            return self
+        try:
+            await granted
+        except asyncio.CancelledError:
+            with self._lock:
+                if grant in self._waiters:
+                    self._waiters.remove(grant)
+                    raise
+            # Cancelled after the slot was handed over: pass it on
+            self.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+
+# Taken by llm_gateway around every model call, blocking or async, so all
+# callers count against the same LLM_CONCURRENCY limit
+llm_slots = SharedSlots(LLM_CONCURRENCY)
+
+
+# =========================
+# EVENT-LOOP OFFLOADING
+# =========================
+
+async def _run(executor, func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_ocr(func, *args, **kwargs):
+    """Run CPU-bound OCR work without blocking the event loop"""
+    return await _run(ocr_executor, func, *args, **kwargs)
+
+
+async def run_llm(func, *args, **kwargs):
+    """
+    Run blocking Gemini work without blocking the event loop. The model call
+    itself takes an llm_slots slot in llm_gateway, so background jobs that
+    submit to llm_executor directly are capped too.
+    """
+    return await _run(llm_executor, func, *args, **kwargs)
+
+
+async def run_io(func, *args, **kwargs):
+    """Run blocking network/disk I/O without blocking the event loop"""
+    return await _run(io_executor, func, *args, **kwargs)
+
+
+def shutdown_executors():
+    for executor in (ocr_executor, llm_executor, io_executor):
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,156 @@
+"""
+Local stand-in for a Gemini GenerativeModel, for offline testing and benchmarks.
+
+Supports the calls the backend makes:
+    model.generate_content(prompt)                           -> response.text
+    await model.generate_content_async(prompt)               -> response.text
+    await model.generate_content_async(prompt, stream=True)  -> async iterator of chunks (.text)
+
+Latency is simulated as a first-token delay plus a delay per chunk, so
+streaming and non-streaming endpoints can be compared on time to first byte.
+failure_rate makes that share of calls raise ConnectionError, to exercise
+the retries and circuit breaker in llm_gateway.
+
+Run the backend against it with LLM_BACKEND=fake, or benchmark the
+streaming endpoints directly:
+    python fake_llm.py --first-token 0.8 --chunk 0.05
+"""
+
+import os
+import time
+import random
+import asyncio
+
+FAKE_LLM_TEXT = (
+    "Ask the dealer to match the market rate of 8.5% APR, request a waiver of "
+    "the processing fee, and confirm there is no penalty for early termination "
+    "before you sign."
+)
+FAKE_LLM_FIRST_TOKEN_SECONDS = float(os.getenv("FAKE_LLM_FIRST_TOKEN_SECONDS", 0.5))
+FAKE_LLM_CHUNK_SECONDS = float(os.getenv("FAKE_LLM_CHUNK_SECONDS", 0.05))
+FAKE_LLM_WORDS_PER_CHUNK = 3
+FAKE_LLM_FAILURE_RATE = float(os.getenv("FAKE_LLM_FAILURE_RATE", 0.0))
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeResponse:
+    """Non-streaming response: the whole text at once"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeStream:
+    """Streaming response: chunks arrive after the first-token delay, then one per chunk delay"""
+
+    def __init__(self, chunks, first_token_latency, chunk_latency):
+        self._chunks = chunks
+        self._first_token_latency = first_token_latency
+        self._chunk_latency = chunk_latency
+
+    async def __aiter__(self):
+        for i, chunk in enumerate(self._chunks):
+            await asyncio.sleep(self._first_token_latency if i == 0 else self._chunk_latency)
+            yield FakeChunk(chunk)
+
+
+class FakeModel:
+    def __init__(self, text=FAKE_LLM_TEXT, first_token_latency=FAKE_LLM_FIRST_TOKEN_SECONDS,
+                 chunk_latency=FAKE_LLM_CHUNK_SECONDS, words_per_chunk=FAKE_LLM_WORDS_PER_CHUNK,
+                 failure_rate=FAKE_LLM_FAILURE_RATE, seed=None):
+        self.text = text
+        self.first_token_latency = first_token_latency
+        self.chunk_latency = chunk_latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+
+        words = text.split(" ")
+        self.chunks = [
+            " ".join(words[i:i + words_per_chunk]) + (" " if i + words_per_chunk < len(words) else "")
+            for i in range(0, len(words), words_per_chunk)
+        ]
+
+    def _total_latency(self):
+        return self.first_token_latency + self.chunk_latency * (len(self.chunks) - 1)
+
+    def _maybe_fail(self):
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise ConnectionError("fake provider unavailable")
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        time.sleep(self._total_latency())
+        self._maybe_fail()
+        return FakeResponse(self.text)
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        self.calls += 1
+        if stream:
+            self._maybe_fail()
+            return FakeStream(self.chunks, self.first_token_latency, self.chunk_latency)
+        await asyncio.sleep(self._total_latency())
+        self._maybe_fail()
+        return FakeResponse(self.text)
+
+
+# =========================
+# BENCHMARK: BLOCKING VS STREAMING ENDPOINTS
+# =========================
+
+if __name__ == "__main__":
+    import json
+    import argparse
+    import httpx
+
+    parser = argparse.ArgumentParser(description="Time to first byte: blocking vs streaming endpoints")
+    parser.add_argument("--first-token", type=float, default=FAKE_LLM_FIRST_TOKEN_SECONDS)
+    parser.add_argument("--chunk", type=float, default=FAKE_LLM_CHUNK_SECONDS)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    os.environ.setdefault("LLM_BACKEND", "fake")  # no Gemini key needed here
+    import main
+    main.llm_gateway().model = FakeModel(first_token_latency=args.first_token, chunk_latency=args.chunk)
+
+    chat_body = {"user_message": "How do I lower my EMI?",
+                 "contract_context": json.dumps({"fairness_score": 62, "sla_analysis": {}})}
+    guidance_body = {"user_message": "Can you lower it?", "dealer_response": "Maybe.",
+                     "contract_context": {}, "negotiation_context": {}}
+
+    async def first_byte(client, path, body):
+        start = time.perf_counter()
+        first = None
+        done = None
+        async with client.stream("POST", path, json=body) as response:
+            async for line in response.aiter_lines():
+                if first is None and line:
+                    first = time.perf_counter() - start
+                if line.startswith("data: ") and '"total_seconds"' in line:
+                    done = json.loads(line[len("data: "):])
+        return first, time.perf_counter() - start, done
+
+    async def run():
+        # A real server: in-process ASGI transports buffer the whole response
+        import uvicorn
+        server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=args.port, log_level="warning"))
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", timeout=30) as client:
+            for path, body in (("/chat", chat_body), ("/negotiation/guidance", guidance_body)):
+                blocking_first, blocking_total, _ = await first_byte(client, path, body)
+                stream_first, stream_total, done = await first_byte(client, f"{path}/stream", body)
+                print(f"{path:<30} blocking: first byte {blocking_first:.2f}s, total {blocking_total:.2f}s")
+                print(f"{path + '/stream':<30} streaming: first byte {stream_first:.2f}s, total {stream_total:.2f}s "
+                      f"(reported ttft {done['ttft_seconds']}s, total {done['total_seconds']}s)")
+
+        server.should_exit = True
+        await serving
+
+    asyncio.run(run())
@@ -0,0 +1,158 @@
+import os
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# =========================
+# CONFIG
+# =========================
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+
+# Finished jobs are kept this long for polling, then dropped
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", 3600))
+
+# An event stream is closed after this long even if its job never finishes
+JOB_STREAM_TIMEOUT_SECONDS = float(os.getenv("JOB_STREAM_TIMEOUT_SECONDS", 3600))
+
+TERMINAL_STATES = ("completed", "failed")
+
+
+# =========================
+# JOB
+# =========================
+
+class Job:
+    """
+    A unit of background work with stage-level progress.
+    Every status/stage change is appended to `events` so clients can stream them.
+    """
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.stages = []
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.events = []
+        self._lock = threading.Lock()
+        self._emit("queued")
+
+    def _emit(self, event: str, **data):
+        with self._lock:
+            self.events.append({"event": event, "time": round(time.time(), 3), **data})
+
+    def progress(self, **data):
+        """Publish intermediate progress (e.g. counts for long batch jobs)"""
+        self._emit("progress", **data)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Record a pipeline stage's progress and wall time"""
+        entry = {"name": name, "status": "running", "seconds": None}
+        self.stages.append(entry)
+        self._emit("stage_started", stage=name)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            entry["status"] = "failed"
+            raise
+        else:
+            entry["status"] = "completed"
+        finally:
+            entry["seconds"] = round(time.perf_counter() - start, 3)
+            self._emit("stage_" + entry["status"], stage=name, seconds=entry["seconds"])
+
+    def events_since(self, index: int):
+        with self._lock:
+            return self.events[index:]
+
+    def snapshot(self):
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stages": [dict(s) for s in self.stages],
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+# =========================
+# QUEUE BACKENDS
+# =========================
+
+class InProcessBackend:
+    """Runs jobs on a local thread pool; no external services required"""
+
+    def __init__(self, workers=JOB_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+
+    def submit(self, func, *args):
+        self._executor.submit(func, *args)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class JobQueue:
+    """Tracks jobs and hands their work to a backend"""
+
+    def __init__(self, backend=None, ttl_seconds=JOB_TTL_SECONDS):
+        self.backend = backend or InProcessBackend()
+        self.ttl_seconds = ttl_seconds
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func, *args) -> Job:
+        """
+        Queue func(job, *args); its return value becomes the job result
+        """
+        job = Job(kind)
+        with self._lock:
+            self._evict_expired()
+            self._jobs[job.id] = job
+        self.backend.submit(self._run, job, func, args)
+        return job
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, func, args):
+        job.status = "running"
+        job._emit("running")
+        try:
+            job.result = func(job, *args)
+            job.status = "completed"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        job.finished_at = time.time()
+        job._emit(job.status, error=job.error)
+
+    def _evict_expired(self):
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        """Stop the backend; jobs it dropped before they started are marked failed"""
+        self.backend.shutdown()
+        with self._lock:
+            queued = [job for job in self._jobs.values() if job.status == "queued"]
+        for job in queued:
+            job.error = "cancelled: server shutting down"
+            job.status = "failed"
+            job.finished_at = time.time()
+            job._emit(job.status, error=job.error)
@@ -0,0 +1,142 @@
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+# =========================
+# CONFIG
+# =========================
+
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", os.path.join("runtime_data", "llm_cache"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 512))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+
+
+# =========================
+# PROMPT-RESULT CACHE
+# =========================
+
+class LLMCache:
+    """
+    Two-tier cache of raw model responses keyed by model name + normalized prompt.
+    Tier 1 is an in-memory LRU; tier 2 is one JSON file per entry on disk
+    (set disk_dir to None for memory only). Both tiers honour ttl_seconds.
+    """
+
+    def __init__(self, max_entries=LLM_CACHE_MAX_ENTRIES,
+                 ttl_seconds=LLM_CACHE_TTL_SECONDS, disk_dir=LLM_CACHE_DIR):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir or None
+        self._memory = OrderedDict()  # key -> (text, expires_at)
+        self._lock = threading.Lock()
+        self._last_purge = time.time()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str) -> str:
+        # Whitespace differences (e.g. OCR spacing) should not defeat the cache
+        normalized = re.sub(r"\s+", " ", prompt).strip()
+        return hashlib.sha256(f"{model_name}\n{normalized}".encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[1] > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+            if entry:
+                del self._memory[key]
+
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                if entry["expires_at"] > now:
+                    with self._lock:
+                        self._remember(key, entry["text"], entry["expires_at"])
+                        self.disk_hits += 1
+                    return entry["text"]
+                os.remove(self._disk_path(key))
+            except (OSError, ValueError, KeyError):
+                pass
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, text: str):
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, text, expires_at)
+
+        if not self.disk_dir:
+            return
+        # A unique temp file per writer: concurrent puts of the same prompt
+        # each replace the entry atomically. The disk tier is best effort,
+        # so a failed write never fails the call that produced the answer.
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, prefix=key + ".", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"text": text, "expires_at": expires_at}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._disk_path(key))
+            tmp_path = None
+            self._purge_disk()
+        except OSError:
+            pass
+        finally:
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _remember(self, key, text, expires_at):
+        self._memory[key] = (text, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _purge_disk(self):
+        now = time.time()
+        if now - self._last_purge < self.ttl_seconds / 10:
+            return
+        self._last_purge = now
+        for name in os.listdir(self.disk_dir):
+            path = os.path.join(self.disk_dir, name)
+            try:
+                if os.path.getmtime(path) + self.ttl_seconds <= now:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0
+            }
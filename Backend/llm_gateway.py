@@ -0,0 +1,469 @@
+"""
+The one way the backend talks to Gemini.
+
+Every call goes through an LLMGateway, which adds:
+    - a token bucket sized to the API quota (requests per minute + burst)
+    - the shared concurrency cap (executors.llm_slots, taken around the model
+      call by blocking and async callers alike, after any quota wait)
+    - retries with full jitter for transient errors
+    - a circuit breaker: after repeated failures calls fail fast with
+      LLMUnavailable for a while, and callers serve their local fallbacks
+    - per-label counters (calls, retries, failures, latency, tokens)
+
+The Gemini key is read from GEMINI_API_KEY only; without it (and without
+LLM_BACKEND=fake, which swaps Gemini for the local stub in fake_llm) the
+gateway cannot be created and LLMConfigurationError says why.
+
+    text = await llm_gateway().generate_async(prompt, label="chat")
+    text = llm_gateway().generate(prompt, label="sla_extraction")
+    async for text in llm_gateway().stream(prompt, label="chat"): ...
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+import google.generativeai as genai
+
+from chunk_selector import estimate_tokens
+from executors import llm_slots
+
+try:
+    from google.api_core import exceptions as google_exceptions
+    _TRANSIENT_GOOGLE_ERRORS = (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+    )
+except ImportError:
+    _TRANSIENT_GOOGLE_ERRORS = ()
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# CONFIG
+# =========================
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME", "gemini-2.5-flash")
+
+# Quota: sustained requests per minute, plus how many may go out back to back
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", 60))
+LLM_BURST = int(os.getenv("LLM_BURST", 10))
+# A call that would wait longer than this for a token fails instead
+LLM_MAX_QUEUE_SECONDS = float(os.getenv("LLM_MAX_QUEUE_SECONDS", 30))
+
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 2))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", 0.5))
+
+# Consecutive failures that open the breaker, and how long it stays open
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", 5))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", 30))
+
+TRANSIENT_ERRORS = (TimeoutError, ConnectionError) + _TRANSIENT_GOOGLE_ERRORS
+
+
+class LLMUnavailable(RuntimeError):
+    """The gateway could not get an answer (breaker open, over quota, or retries exhausted)"""
+
+
+class LLMConfigurationError(RuntimeError):
+    """No usable model: GEMINI_API_KEY is not set and LLM_BACKEND is not fake"""
+
+
+# =========================
+# TOKEN BUCKET
+# =========================
+
+class TokenBucket:
+    """
+    rate tokens per second, at most capacity banked. reserve() takes a token
+    and returns how long the caller must wait before using it, so blocking
+    and async callers can share one bucket.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float = None):
+        """Seconds to wait for the reserved token; None (nothing reserved) if over max_wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+# =========================
+# CIRCUIT BREAKER
+# =========================
+
+class CircuitBreaker:
+    """
+    closed -> open after failure_threshold consecutive failures; open -> half_open
+    after reset_seconds, when one trial call is let through; its success closes
+    the breaker, its failure opens it again. A trial that ends without either
+    (refused by the quota, stream closed early, cancelled) must call
+    release_trial() so the next call can be the trial.
+    """
+
+    ALLOWED = "allowed"
+    TRIAL = "trial"
+
+    def __init__(self, failure_threshold=LLM_BREAKER_FAILURES, reset_seconds=LLM_BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """ALLOWED, TRIAL (the half-open probe) or None (fail fast)"""
+        with self._lock:
+            if self.state == "closed":
+                return self.ALLOWED
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self._trial_running = False
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return self.TRIAL
+            return None
+
+    def release_trial(self):
+        """End a trial that neither succeeded nor failed; no-op once it has"""
+        with self._lock:
+            if self.state == "half_open":
+                self._trial_running = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opened += 1
+                    logger.warning("LLM circuit opened after %d failures", self.failures)
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._trial_running = False
+
+
+# =========================
+# GATEWAY
+# =========================
+
+def _usage(response, prompt, text):
+    """(prompt_tokens, output_tokens) from the response metadata, else estimated"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        return getattr(usage, "prompt_token_count", 0) or 0, getattr(usage, "candidates_token_count", 0) or 0
+    return estimate_tokens(prompt), estimate_tokens(text or "")
+
+
+class LLMGateway:
+
+    def __init__(self, model, model_name=LLM_MODEL_NAME,
+                 requests_per_minute=LLM_REQUESTS_PER_MINUTE, burst=LLM_BURST,
+                 max_queue_seconds=LLM_MAX_QUEUE_SECONDS, max_retries=LLM_MAX_RETRIES,
+                 retry_base_seconds=LLM_RETRY_BASE_SECONDS, breaker=None):
+        self.model = model
+        self.model_name = model_name
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self.max_queue_seconds = max_queue_seconds
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.breaker = breaker or CircuitBreaker()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    # ---------- counters ----------
+
+    def _count(self, label, **values):
+        with self._lock:
+            counters = self._counters.setdefault(label, {
+                "calls": 0, "succeeded": 0, "failed": 0, "short_circuited": 0, "rate_limited": 0,
+                "retries": 0, "queued_seconds": 0.0, "latency_seconds": 0.0, "max_latency_seconds": 0.0,
+                "prompt_tokens": 0, "output_tokens": 0,
+            })
+            for name, value in values.items():
+                if name == "max_latency_seconds":
+                    counters[name] = max(counters[name], value)
+                else:
+                    counters[name] += value
+
+    def stats(self):
+        with self._lock:
+            calls = {
+                label: {
+                    **{k: round(v, 3) if isinstance(v, float) else v for k, v in c.items()},
+                    "avg_latency_seconds": round(c["latency_seconds"] / c["succeeded"], 3) if c["succeeded"] else None,
+                }
+                for label, c in self._counters.items()
+            }
+        return {
+            "model": self.model_name,
+            "breaker": {"state": self.breaker.state, "consecutive_failures": self.breaker.failures,
+                        "times_opened": self.breaker.opened},
+            "calls": calls,
+        }
+
+    # ---------- admission ----------
+
+    def _reserve(self, label):
+        """Quota token for one model request: seconds to wait for it"""
+        wait = self.bucket.reserve(self.max_queue_seconds)
+        if wait is None:
+            self._count(label, rate_limited=1)
+            raise LLMUnavailable("LLM quota exhausted")
+        self._count(label, queued_seconds=wait)
+        return wait
+
+    def _admit(self, label):
+        """Breaker and quota checks: (seconds to wait before calling, is breaker trial)"""
+        self._count(label, calls=1)
+        admission = self.breaker.allow()
+        if admission is None:
+            self._count(label, short_circuited=1)
+            raise LLMUnavailable("LLM circuit open")
+        trial = admission == CircuitBreaker.TRIAL
+        try:
+            return self._reserve(label), trial
+        except LLMUnavailable:
+            if trial:
+                self.breaker.release_trial()
+            raise
+
+    def _retry_wait(self, label, attempt, error):
+        """
+        Seconds before retry number attempt + 1: jittered backoff, but never
+        less than the wait for the retry's own quota token (a retry is a
+        request like any other). Raises LLMUnavailable if there is no token.
+        """
+        try:
+            quota_wait = self._reserve(label)
+        except LLMUnavailable:
+            raise self._failed(label, error) from error
+        self._count(label, retries=1)
+        # Full jitter: spreads retries from concurrent callers apart
+        return max(random.uniform(0, self.retry_base_seconds * (2 ** attempt)), quota_wait)
+
+    def _succeeded(self, label, started, prompt, response, text):
+        latency = time.perf_counter() - started
+        prompt_tokens, output_tokens = _usage(response, prompt, text)
+        self.breaker.record_success()
+        self._count(label, succeeded=1, latency_seconds=latency, max_latency_seconds=latency,
+                    prompt_tokens=prompt_tokens, output_tokens=output_tokens)
+
+    def _failed(self, label, error):
+        self.breaker.record_failure()
+        self._count(label, failed=1)
+        logger.warning("LLM call (%s) failed: %s: %s", label, type(error).__name__, error)
+        return LLMUnavailable(f"{type(error).__name__}: {error}")
+
+    # ---------- calls ----------
+
+    # Each call waits for its quota token before taking an llm_slots slot, so
+    # a call queued on the quota does not hold back calls that could run.
+    # The finally blocks free the breaker trial when a call ends with no
+    # verdict: a stream closed early by the client, or a cancelled task.
+
+    def generate(self, prompt: str, label: str = "default") -> str:
+        """Blocking call (keep it off the event loop, e.g. executors.run_llm); raises LLMUnavailable"""
+        wait, trial = self._admit(label)
+        try:
+            time.sleep(wait)
+            started = time.perf_counter()
+            for attempt in range(self.max_retries + 1):
+                try:
+                    with llm_slots:
+                        response = self.model.generate_content(prompt)
+                    text = response.text
+                except TRANSIENT_ERRORS as e:
+                    if attempt == self.max_retries:
+                        raise self._failed(label, e) from e
+                    time.sleep(self._retry_wait(label, attempt, e))
+                except Exception as e:
+                    raise self._failed(label, e) from e
+                else:
+                    self._succeeded(label, started, prompt, response, text)
+                    return text
+        finally:
+            if trial:
+                self.breaker.release_trial()
+
+    async def generate_async(self, prompt: str, label: str = "default") -> str:
+        """Non-blocking call holding an llm_slots slot; raises LLMUnavailable"""
+        wait, trial = self._admit(label)
+        try:
+            await asyncio.sleep(wait)
+            started = time.perf_counter()
+            for attempt in range(self.max_retries + 1):
+                try:
+                    async with llm_slots:
+                        response = await self.model.generate_content_async(prompt)
+                    text = response.text
+                except TRANSIENT_ERRORS as e:
+                    if attempt == self.max_retries:
+                        raise self._failed(label, e) from e
+                    await asyncio.sleep(self._retry_wait(label, attempt, e))
+                except Exception as e:
+                    raise self._failed(label, e) from e
+                else:
+                    self._succeeded(label, started, prompt, response, text)
+                    return text
+        finally:
+            if trial:
+                self.breaker.release_trial()
+
+    async def stream(self, prompt: str, label: str = "default"):
+        """
+        Async iterator of text chunks. Retries only before the first chunk;
+        a failure after that ends the stream with LLMUnavailable.
+        """
+        wait, trial = self._admit(label)
+        try:
+            await asyncio.sleep(wait)
+            started = time.perf_counter()
+            parts = []
+            for attempt in range(self.max_retries + 1):
+                chunks = asyncio.Queue()
+                reader = asyncio.create_task(self._read_stream(prompt, chunks))
+                try:
+                    while (text := await chunks.get()) is not None:
+                        if isinstance(text, Exception):
+                            raise text
+                        parts.append(text)
+                        yield text
+                except TRANSIENT_ERRORS as e:
+                    if parts or attempt == self.max_retries:
+                        raise self._failed(label, e) from e
+                    await asyncio.sleep(self._retry_wait(label, attempt, e))
+                except Exception as e:
+                    raise self._failed(label, e) from e
+                else:
+                    self._succeeded(label, started, prompt, None, "".join(parts))
+                    return
+                finally:
+                    reader.cancel()  # no-op unless the client went away mid-stream
+        finally:
+            if trial:
+                self.breaker.release_trial()
+
+    async def _read_stream(self, prompt, chunks):
+        """
+        Read one upstream stream into the chunks queue, then None (or the
+        error). The llm_slots slot is held only while the provider is
+        sending, not while a slow client drains the queue.
+        """
+        try:
+            async with llm_slots:
+                response = await self.model.generate_content_async(prompt, stream=True)
+                async for chunk in response:
+                    if chunk.text:
+                        chunks.put_nowait(chunk.text)
+        except Exception as e:
+            chunks.put_nowait(e)
+        else:
+            chunks.put_nowait(None)
+
+
+# =========================
+# SHARED INSTANCE
+# =========================
+
+_default_gateway = None
+_default_lock = threading.Lock()
+
+
+def _default_model():
+    # LLM_BACKEND=fake serves every call from the local stub model (fake_llm)
+    if os.getenv("LLM_BACKEND") == "fake":
+        from fake_llm import FakeModel
+        return FakeModel()
+    if not GEMINI_API_KEY:
+        raise LLMConfigurationError(
+            "GEMINI_API_KEY is not set. Export it to use Gemini, "
+            "or set LLM_BACKEND=fake to run against the local stub model."
+        )
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel(LLM_MODEL_NAME)
+
+
+def llm_gateway() -> LLMGateway:
+    global _default_gateway
+    with _default_lock:
+        if _default_gateway is None:
+            _default_gateway = LLMGateway(_default_model())
+        return _default_gateway
+
+
+# =========================
+# BENCHMARK: FLAKY STUB BEHIND THE GATEWAY
+# =========================
+
+if __name__ == "__main__":
+    import json
+    import argparse
+    from fake_llm import FakeModel
+
+    parser = argparse.ArgumentParser(description="Gateway behaviour against a flaky local stub model")
+    parser.add_argument("--calls", type=int, default=60)
+    parser.add_argument("--failure-rate", type=float, default=0.2)
+    parser.add_argument("--rpm", type=float, default=600)
+    parser.add_argument("--burst", type=int, default=10)
+    args = parser.parse_args()
+
+    async def run(gateway, outage_after=None):
+        served = fallbacks = 0
+
+        async def one(i):
+            nonlocal served, fallbacks
+            if outage_after is not None and i == outage_after:
+                gateway.model.failure_rate = 1.0
+            try:
+                await gateway.generate_async(f"prompt {i}", label="bench")
+                served += 1
+            except LLMUnavailable:
+                fallbacks += 1
+
+        start = time.perf_counter()
+        # Arrive in waves of 10, as concurrent users would
+        for wave in range(0, args.calls, 10):
+            await asyncio.gather(*(one(i) for i in range(wave, min(wave + 10, args.calls))))
+        return served, fallbacks, time.perf_counter() - start
+
+    async def main():
+        # Scenarios run one after another on one event loop
+        for name, outage_after in (("flaky provider", None), ("provider outage mid-run", args.calls // 3)):
+            stub = FakeModel(first_token_latency=0.02, chunk_latency=0.0, failure_rate=args.failure_rate, seed=1)
+            gateway = LLMGateway(stub, model_name="fake", requests_per_minute=args.rpm, burst=args.burst,
+                                 retry_base_seconds=0.02, breaker=CircuitBreaker(5, reset_seconds=60))
+            served, fallbacks, elapsed = await run(gateway, outage_after)
+            bench = gateway.stats()["calls"]["bench"]
+            print(f"{name}: {served} answered, {fallbacks} fallbacks in {elapsed:.2f}s; "
+                  f"model calls {stub.calls}, retries {bench['retries']}, "
+                  f"short-circuited {bench['short_circuited']}, breaker {gateway.breaker.state}")
+            print("  " + json.dumps(bench))
+
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Concurrent load test for the contract analyzer API.
+
+Uploads a PDF from many clients at once and reports latency percentiles.
+By default every /ocr upload gets a unique trailing PDF comment, so each
+request misses the OCR cache and the numbers measure concurrent OCR;
+--repeat-pdf sends identical bytes (cache hits after the first upload).
+
+Usage:
+    python loadgen.py --pdf ../Sample_contract.pdf --clients 8 --requests 40
+    python loadgen.py --endpoint analyze --clients 4 --requests 20
+"""
+
+import argparse
+import math
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _unique_pdf(pdf_bytes):
+    """Same document, different bytes: a comment after %%EOF defeats the OCR cache"""
+    return pdf_bytes + f"\n%loadgen {uuid.uuid4().hex}\n".encode("ascii")
+
+
+def _upload(base_url, pdf_bytes, pdf_name):
+    return requests.post(
+        f"{base_url}/ocr",
+        files={"file": (pdf_name, pdf_bytes, "application/pdf")},
+        timeout=600
+    )
+
+
+def _call(base_url, endpoint, pdf_bytes, pdf_name, document_id=None, repeat_pdf=False):
+    if endpoint == "ocr" and not repeat_pdf:
+        pdf_bytes = _unique_pdf(pdf_bytes)
+    start = time.perf_counter()
+    try:
+        if endpoint == "ocr":
+            response = _upload(base_url, pdf_bytes, pdf_name)
+        elif endpoint == "analyze":
+            response = requests.get(
+                f"{base_url}/analyze", params={"document_id": document_id}, timeout=600
+            )
+        else:
+            response = requests.get(f"{base_url}/", timeout=60)
+        ok = response.status_code == 200
+    except requests.RequestException:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run_load_test(base_url, endpoint, pdf_path, clients, total_requests, repeat_pdf=False):
+    with open(pdf_path, "rb") as f:
+        pdf_bytes = f.read()
+    pdf_name = pdf_path.replace("\\", "/").split("/")[-1]
+
+    # /analyze needs a document to work on; upload it once up front
+    document_id = None
+    if endpoint == "analyze":
+        document_id = _upload(base_url, pdf_bytes, pdf_name).json()["document_id"]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(
+            lambda _: _call(base_url, endpoint, pdf_bytes, pdf_name, document_id, repeat_pdf),
+            range(total_requests)
+        ))
+    wall = time.perf_counter() - start
+
+    latencies = [seconds for seconds, ok in results if ok]
+    failures = sum(1 for _, ok in results if not ok)
+
+    report = {
+        "endpoint": endpoint,
+        "clients": clients,
+        "requests": total_requests,
+        "failures": failures,
+        "wall_seconds": round(wall, 2),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+    }
+    if endpoint == "ocr":
+        report["pdf_bytes"] = "repeated (OCR cache hits)" if repeat_pdf else "unique per request (OCR cache misses)"
+    if latencies:
+        report.update({
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+            "p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+            "mean_ms": round(statistics.mean(latencies) * 1000, 1),
+            "max_ms": round(max(latencies) * 1000, 1),
+        })
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the contract analyzer API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=["ocr", "analyze", "health"], default="ocr")
+    parser.add_argument("--pdf", default="../Sample_contract.pdf")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--repeat-pdf", action="store_true",
+                        help="upload identical bytes every time, so /ocr is served from the OCR cache")
+    args = parser.parse_args()
+
+    report = run_load_test(args.url, args.endpoint, args.pdf, args.clients, args.requests, args.repeat_pdf)
+    for key, value in report.items():
+        print(f"{key:>15}: {value}")
@@ -0,0 +1,217 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# =========================
+# MICRO-BATCHING SCHEDULER
+# =========================
+
+class MicroBatcher:
+    """
+    Collects items submitted from many threads and hands them to run_batch
+    together. A batch opens with the first waiting item and closes when
+    window_seconds have passed since then, max_items are collected, or the
+    next item would push the summed cost(item) past token_budget (an item
+    over budget on its own still goes, alone).
+
+    run_batch(items) must return one result per item, in order; if it raises,
+    every item in the batch gets the exception. Batches run on their own
+    worker threads, so the next window collects while one is in flight.
+    max_items <= 1 turns batching off: call() runs run_batch([item]) directly.
+    """
+
+    def __init__(self, run_batch, window_seconds=0.05, max_items=8, token_budget=8000,
+                 cost=lambda item: 1, workers=4, name="batch"):
+        self.run_batch = run_batch
+        self.window_seconds = window_seconds
+        self.max_items = max_items
+        self.token_budget = token_budget
+        self.cost = cost
+        self.name = name
+        self._queue = deque()  # (item, future, cost, enqueued_at)
+        self._cond = threading.Condition()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._collector = None
+        self._closed = False
+        self.batches = 0
+        self.items = 0
+        self.max_batch_size = 0
+
+    def submit(self, item) -> Future:
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"{self.name} batcher is shut down")
+            if self._collector is None:
+                self._collector = threading.Thread(target=self._collect_loop, name=f"{self.name}-collector", daemon=True)
+                self._collector.start()
+            self._queue.append((item, future, self.cost(item), time.monotonic()))
+            self._cond.notify()
+        return future
+
+    def call(self, item):
+        """Result for one item, waiting for its batch"""
+        if self.max_items <= 1:
+            self._record(1)
+            return self.run_batch([item])[0]
+        return self.submit(item).result()
+
+    # ---------- collector ----------
+
+    def _next_batch(self):
+        """Block until a batch is ready; None once shut down and drained"""
+        with self._cond:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+            deadline = self._queue[0][3] + self.window_seconds
+            batch = []
+            used = 0
+            while len(batch) < self.max_items:
+                if self._queue:
+                    cost = self._queue[0][2]
+                    if batch and used + cost > self.token_budget:
+                        break
+                    batch.append(self._queue.popleft())
+                    used += cost
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    break
+                self._cond.wait(remaining)
+            return batch
+
+    def _collect_loop(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._record(len(batch))
+            self._pool.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch):
+        try:
+            results = self.run_batch([entry[0] for entry in batch])
+        except Exception as e:
+            for entry in batch:
+                entry[1].set_exception(e)
+            return
+        for entry, result in zip(batch, results):
+            entry[1].set_result(result)
+
+    def _record(self, size):
+        with self._cond:
+            self.batches += 1
+            self.items += size
+            self.max_batch_size = max(self.max_batch_size, size)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "waiting": len(self._queue),
+                "window_ms": round(1000 * self.window_seconds, 1),
+                "max_items": self.max_items,
+                "token_budget": self.token_budget,
+            }
+
+    def shutdown(self):
+        """Stop accepting items; waiting items still go out, in-flight batches finish in the background"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._collector is not None:
+            self._collector.join()
+        self._pool.shutdown(wait=False)
+
+
+# =========================
+# BENCHMARK: SLA EXTRACTION, BATCHED VS ONE PROMPT PER CONTRACT
+# =========================
+
+if __name__ == "__main__":
+    import re
+    import json
+    import argparse
+    from concurrent.futures import ThreadPoolExecutor as Uploads
+
+    parser = argparse.ArgumentParser(description="SLA extraction calls with and without micro-batching")
+    parser.add_argument("--contract", default="output/test_output.txt", help="OCR text to vary into a corpus")
+    parser.add_argument("--contracts", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8, help="uploads in flight (LLM_CONCURRENCY)")
+    parser.add_argument("--base-latency", type=float, default=0.8, help="fake model seconds per call")
+    parser.add_argument("--per-token", type=float, default=0.0002, help="fake model seconds per prompt token")
+    parser.add_argument("--windows-ms", default="0,20,50,100", help="windows to try (0 = batching off)")
+    parser.add_argument("--max-docs", type=int, default=8)
+    parser.add_argument("--rpm", type=float, default=0, help="gateway quota, requests per minute (0 = unlimited)")
+    args = parser.parse_args()
+
+    import llm_engine
+    from llm_cache import LLMCache
+    from llm_gateway import llm_gateway, TokenBucket
+    from chunk_selector import estimate_tokens
+    from rule_extractor import SLA_FIELDS
+
+    class JsonFakeModel:
+        """Answers single and multi-contract SLA prompts; latency grows with prompt size"""
+
+        def __init__(self):
+            self.calls = 0
+            self._lock = threading.Lock()
+
+        def generate_content(self, prompt, **kwargs):
+            with self._lock:
+                self.calls += 1
+            time.sleep(args.base_latency + args.per_token * estimate_tokens(prompt))
+            fields = {f: {"value": "as per clause", "confidence": 0.9} for f in SLA_FIELDS}
+            ids = re.findall(r"=== (contract_\d+) ===", prompt)
+
+            class Response:
+                text = json.dumps({i: fields for i in ids} if ids else fields)
+            return Response()
+
+    with open(args.contract, "r", encoding="utf-8") as f:
+        base_text = f.read()
+    # Vary a clause the SLA prompt quotes, so no two contracts share a cache entry
+    corpus = [base_text.replace("30days'", f"{30 + i}days'") for i in range(args.contracts)]
+
+    gateway = llm_gateway()
+    if args.rpm:
+        quota = (args.rpm / 60.0, 10)
+        print(f"gateway quota {args.rpm:.0f} requests/minute, burst 10")
+    else:
+        quota = (1000.0, 1000)
+
+    print(f"{args.contracts} contracts, {args.concurrency} uploads in flight, max {args.max_docs} per batch")
+    for window_ms in (float(w) for w in args.windows_ms.split(",")):
+        gateway.model = JsonFakeModel()
+        gateway.bucket = TokenBucket(*quota)
+        llm_engine.llm_cache = LLMCache(disk_dir=None)
+        llm_engine.sla_batcher = MicroBatcher(
+            llm_engine._run_sla_batch, window_seconds=window_ms / 1000,
+            max_items=args.max_docs if window_ms > 0 else 1,
+            cost=lambda doc: estimate_tokens(doc[0]), name="bench",
+        )
+
+        def upload(text):
+            start = time.perf_counter()
+            sla_data, _ = llm_engine.extract_sla_fields_with_report(text)
+            assert sla_data["termination_clause"]["value"] == "as per clause"
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with Uploads(max_workers=args.concurrency) as pool:
+            latencies = sorted(pool.map(upload, corpus))
+        elapsed = time.perf_counter() - start
+        llm_engine.sla_batcher.shutdown()
+
+        stats = llm_engine.sla_batcher.stats()
+        print(f"window {window_ms:>5.0f} ms: {gateway.model.calls:>3} model calls "
+              f"(avg batch {stats['avg_batch_size']}), {elapsed:.2f}s total, "
+              f"p50 {latencies[len(latencies) // 2]:.2f}s, p95 {latencies[int(len(latencies) * 0.95)]:.2f}s per contract")
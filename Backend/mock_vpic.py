@@ -0,0 +1,129 @@
+"""
+Local stand-in for the NHTSA vPIC API, for offline testing and benchmarks.
+
+Serves the two endpoints vin_service uses:
+    GET  /decodevin/<VIN>?format=json
+    POST /DecodeVINValuesBatch/   (form data: DATA=VIN1;VIN2;...)
+
+broken=True answers every request with a 200 HTML error page instead of
+JSON, as vPIC does during maintenance.
+
+Usage:
+    python mock_vpic.py --port 8090 --latency 0.05
+    VPIC_BASE_URL=http://127.0.0.1:8090 uvicorn main:app
+"""
+
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from vin_decoder import with_check_digit
+
+_MAKES = {
+    "KMH": ("HYUNDAI", "HYUNDAI MOTOR CO", ["CRETA", "ELANTRA", "TUCSON"]),
+    "MA3": ("MARUTI SUZUKI", "MARUTI SUZUKI INDIA LTD", ["SWIFT", "BALENO", "DZIRE"]),
+    "MAT": ("TATA", "TATA MOTORS LTD", ["NEXON", "HARRIER", "PUNCH"]),
+    "JTD": ("TOYOTA", "TOYOTA MOTOR CORPORATION", ["COROLLA", "YARIS", "CAMRY"]),
+    "1HG": ("HONDA", "AMERICAN HONDA MOTOR CO., INC.", ["CIVIC", "ACCORD", "CITY"]),
+}
+
+_YEARS = {c: 2010 + i for i, c in enumerate("ABCDEFGHJKLMNPRSTVWXY")}
+
+
+def _decode(vin):
+    make, manufacturer, models = _MAKES.get(vin[:3], ("", "", [""]))
+    return {
+        "Make": make,
+        "Model": models[sum(map(ord, vin)) % len(models)] if make else "",
+        "Model Year": str(_YEARS.get(vin[9], "")) if len(vin) == 17 else "",
+        "Body Class": "Sport Utility Vehicle (SUV)/Multi-Purpose Vehicle (MPV)" if make else "",
+        "Fuel Type - Primary": "Gasoline" if make else "",
+        "Manufacturer Name": manufacturer,
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    latency = 0.0
+    broken = False
+
+    def _send(self, payload):
+        time.sleep(self.latency)
+        if self.broken:
+            body, content_type = b"<html><body>Service Unavailable</body></html>", "text/html"
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip("/")
+        if "/decodevin/" not in path.lower():
+            self.send_error(404)
+            return
+        vin = path.rsplit("/", 1)[-1].upper()
+        results = [{"Variable": k, "Value": v or None} for k, v in _decode(vin).items()]
+        self._send({"Count": len(results), "Results": results})
+
+    def do_POST(self):
+        if "decodevinvaluesbatch" not in self.path.lower():
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        vins = [v.strip().upper() for v in form.get("DATA", [""])[0].split(";") if v.strip()]
+
+        results = []
+        for vin in vins:
+            decoded = _decode(vin)
+            results.append({
+                "VIN": vin,
+                "Make": decoded["Make"],
+                "Model": decoded["Model"],
+                "ModelYear": decoded["Model Year"],
+                "BodyClass": decoded["Body Class"],
+                "FuelTypePrimary": decoded["Fuel Type - Primary"],
+                "Manufacturer": decoded["Manufacturer Name"],
+            })
+        self._send({"Count": len(results), "Results": results})
+
+    def log_message(self, *args):
+        pass
+
+
+def start_mock_vpic(port=0, latency=0.0, broken=False):
+    """Start the mock in a background thread; returns (server, base_url)"""
+    handler = type("Handler", (_Handler,), {"latency": latency, "broken": broken})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def sample_vins(count):
+    """Deterministic, syntactically valid VINs across the mocked manufacturers"""
+    wmis = list(_MAKES)
+    years = list(_YEARS)
+    return [
+        with_check_digit(f"{wmis[i % len(wmis)]}EC4A40{years[i % len(years)]}U{i:06d}")
+        for i in range(count)
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local mock of the NHTSA vPIC API")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    args = parser.parse_args()
+
+    server, base_url = start_mock_vpic(args.port, args.latency)
+    print(f"Mock vPIC running at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+import threading
+
+# =========================
+# CONFIG
+# =========================
+
+OCR_CACHE_DIR = os.path.join("runtime_data", "ocr_cache")
+OCR_CACHE_MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+
+
+# =========================
+# CONTENT-ADDRESSED OCR CACHE
+# =========================
+
+class OCRCache:
+    """
+    On-disk cache of OCR results keyed by SHA-256 of the PDF bytes + OCR settings.
+    Entries are evicted least-recently-used once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, directory=OCR_CACHE_DIR, max_bytes=OCR_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+        # key -> size, oldest first (file mtime is refreshed on every hit)
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(directory, name))
+                entries.append((stat.st_mtime, name[:-5], stat.st_size))
+        self._index = {key: size for _, key, size in sorted(entries)}
+        self._total_bytes = sum(self._index.values())
+
+    @staticmethod
+    def make_key(pdf_bytes: bytes, settings: dict) -> str:
+        digest = hashlib.sha256(pdf_bytes)
+        digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                os.utime(self._path(key))
+            except (OSError, ValueError):
+                self._total_bytes -= self._index.pop(key)
+                self.misses += 1
+                return None
+
+            # Move to most-recently-used position
+            self._index[key] = self._index.pop(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry: dict):
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+        with self._lock:
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+
+            self._total_bytes -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+
+            while self._total_bytes > self.max_bytes and len(self._index) > 1:
+                oldest = next(iter(self._index))
+                self._total_bytes -= self._index.pop(oldest)
+                self.evictions += 1
+                try:
+                    os.remove(self._path(oldest))
+                except OSError:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
@@ -0,0 +1,70 @@
+import time
+import asyncio
+
+# =========================
+# STAGE-DAG EXECUTOR
+# =========================
+
+def _topological_order(stages):
+    """Validate dependencies and return stage names in a runnable order"""
+    order, visiting, done = [], set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Cycle in stage graph at '{name}'")
+        if name not in stages:
+            raise ValueError(f"Unknown stage '{name}'")
+        visiting.add(name)
+        for dep in stages[name][1]:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for name in stages:
+        visit(name)
+    return order
+
+
+async def run_stage_graph(stages):
+    """
+    Run a DAG of async stages, starting each one as soon as its dependencies finish.
+
+    stages: {name: (async_func, [dependency names])}
+            async_func receives the dependency results in the listed order.
+
+    Returns (results, timings) where timings[name] holds the stage's start
+    offset and wall time in seconds, plus "total_seconds" for the whole graph.
+    """
+    order = _topological_order(stages)
+    graph_start = time.perf_counter()
+    tasks = {}
+    timings = {}
+
+    async def run(name):
+        func, deps = stages[name]
+        args = [await tasks[dep] for dep in deps]
+
+        start = time.perf_counter()
+        result = await func(*args)
+        timings[name] = {
+            "start": round(start - graph_start, 3),
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+        return result
+
+    # Every task is created before any of them runs, so deps are always in `tasks`
+    for name in order:
+        tasks[name] = asyncio.ensure_future(run(name))
+
+    try:
+        values = await asyncio.gather(*tasks.values())
+    except Exception:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    timings["total_seconds"] = round(time.perf_counter() - graph_start, 3)
+    return dict(zip(tasks.keys(), values)), timings
@@ -0,0 +1,82 @@
+import os
+import time
+import asyncio
+from collections import OrderedDict
+
+# =========================
+# CONFIG
+# =========================
+
+PRICE_CACHE_MAX_ENTRIES = int(os.getenv("PRICE_CACHE_MAX_ENTRIES", 2048))
+PRICE_CACHE_TTL_SECONDS = int(os.getenv("PRICE_CACHE_TTL_SECONDS", 6 * 3600))
+
+
+# =========================
+# PRICE QUOTE CACHE (SINGLE-FLIGHT)
+# =========================
+
+class PriceQuoteCache:
+    """
+    In-memory LRU of provider quotes keyed by vehicle, with TTL.
+    Concurrent misses for the same key share one in-flight computation
+    (single-flight), so a burst of identical requests costs one provider query.
+    Used from the event loop only, so it needs no lock.
+    """
+
+    def __init__(self, max_entries=PRICE_CACHE_MAX_ENTRIES, ttl_seconds=PRICE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._inflight = {}            # key -> asyncio.Task
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(make: str, model: str, year: int):
+        return ((make or "").strip().lower(), (model or "").strip().lower(), int(year))
+
+    def _store(self, key, value):
+        self._entries[key] = (value, time.time() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(self, key, compute, cacheable=lambda value: True):
+        """
+        Cached value for key, or the result of awaiting compute() (shared with any
+        concurrent caller for the same key). Results failing cacheable() are
+        returned but not stored.
+        """
+        entry = self._entries.get(key)
+        if entry and entry[1] > time.time():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+
+            def finished(done, key=key):
+                self._inflight.pop(key, None)
+                if not done.cancelled() and done.exception() is None and cacheable(done.result()):
+                    self._store(key, done.result())
+
+            task.add_done_callback(finished)
+
+        # shield: one caller disconnecting must not cancel the shared computation
+        return await asyncio.shield(task)
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
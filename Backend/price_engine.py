@@ -3,7 +3,12 @@ Simple Price Estimation Engine
 Automatically uses contract vehicle details
 """
 
+import os
 import random
+import logging
+from functools import lru_cache
+
+import numpy as np
 
 
 # Indian car base prices (2026)
@@ -18,13 +23,42 @@ BRAND_PRICES = {
     "default": 700000
 }
 
+logger = logging.getLogger(__name__)
+
+CURRENT_YEAR = 2026
+
+# Market variation is seeded per (make, model, year), so the same request
+# always gets the same price; change the seed to draw a different market
+PRICE_SEED = int(os.getenv("PRICE_SEED", 0))
+DEPRECIATION_RATE = 0.15    # per year
+MAX_DEPRECIATION_YEARS = 15
+MIN_VEHICLE_PRICE = 100000
+
+# Default loan terms for market EMIs
+DEFAULT_DOWN_PAYMENT = 0.20
+DEFAULT_TERM_MONTHS = 36
+DEFAULT_APR = 8.5
+
+# Remaining value after n years: (1 - rate) ** n, precomputed for every allowed age
+DEPRECIATION_FACTORS = [(1 - DEPRECIATION_RATE) ** age for age in range(MAX_DEPRECIATION_YEARS + 1)]
+
 
-def calculate_price(make: str, year: int) -> dict:
-    """Calculate vehicle price based on make and year"""
+@lru_cache(maxsize=1024)
+def annuity_factor(apr: float, months: int) -> float:
+    """EMI per rupee of principal: r(1+r)^n / ((1+r)^n - 1), r = monthly rate"""
+    rate = apr / (12 * 100)
+    if rate == 0:
+        return 1 / months
+    growth = (1 + rate) ** months
+    return rate * growth / (growth - 1)
+
+
+def calculate_price(make: str, year: int, model: str = "", seed: int = PRICE_SEED) -> dict:
+    """Calculate vehicle price based on make and year (deterministic for a given seed)"""
     
     # Handle empty/invalid inputs
     if not make or year <= 0:
-        print(f"⚠️ Invalid input: make='{make}', year={year}")
+        logger.warning("Invalid price input: make=%r, year=%s", make, year)
         return {
             "vehicle_price": 0,
             "min_price": 0,
@@ -34,28 +68,19 @@ def calculate_price(make: str, year: int) -> dict:
     # Get base price for brand
     base_price = BRAND_PRICES.get(make.lower().strip(), BRAND_PRICES["default"])
     
-    # Apply depreciation (15% per year)
-    current_year = 2026
-    age = current_year - year
-    
-    # Validate year (not too old, not future)
-    if age < 0:
-        age = 0  # Future car, no depreciation
-    elif age > 15:
-        age = 15  # Cap depreciation at 15 years
+    # Apply depreciation (15% per year, capped at 15 years; future cars don't depreciate)
+    age = min(max(CURRENT_YEAR - year, 0), MAX_DEPRECIATION_YEARS)
+    base_price = int(base_price * DEPRECIATION_FACTORS[age])
     
-    # Apply depreciation
-    for _ in range(age):
-        base_price = int(base_price * 0.85)
-    
-    # Add random market variation (±5%)
-    base_price = int(base_price * random.uniform(0.95, 1.05))
+    # Add seeded market variation (±5%)
+    market = random.Random(f"{seed}:{make.lower().strip()}:{model.lower().strip()}:{year}")
+    base_price = int(base_price * market.uniform(0.95, 1.05))
     
     # Ensure minimum price
-    if base_price < 100000:
-        base_price = 100000
+    if base_price < MIN_VEHICLE_PRICE:
+        base_price = MIN_VEHICLE_PRICE
     
-    print(f"💰 Price for {make} {year}: ₹{base_price:,}")
+    logger.debug("Price for %s %s: ₹%s", make, year, base_price)
     
     return {
         "vehicle_price": base_price,
@@ -64,52 +89,41 @@ def calculate_price(make: str, year: int) -> dict:
     }
 
 
-def calculate_emi(price: int) -> int:
-    """Calculate monthly EMI (20% down, 36 months, 8.5% interest)"""
+def calculate_emi(price: int, down_payment: float = DEFAULT_DOWN_PAYMENT,
+                  months: int = DEFAULT_TERM_MONTHS, apr: float = DEFAULT_APR) -> int:
+    """Calculate monthly EMI (default: 20% down, 36 months, 8.5% interest)"""
     
     if price <= 0:
         return 0
     
-    principal = price * 0.8  # 80% loan amount
-    months = 36
-    rate = 8.5 / (12 * 100)  # Monthly interest rate
-    
-    # EMI formula
-    emi = principal * rate * ((1 + rate) ** months) / (((1 + rate) ** months) - 1)
-    
-    return int(emi)
+    principal = price * (1 - down_payment)
+    return int(principal * annuity_factor(apr, months))
 
 
-def get_source_1(make: str, model: str, year: int) -> dict:
-    """Source 1: Indian Market Data"""
-    
-    pricing = calculate_price(make, year)
-    monthly = calculate_emi(pricing["vehicle_price"])
-    
-    print(f"📊 Source 1 (Market): {make} {model} {year} → ₹{monthly:,}/month")
-    
-    return {
-        "source": "Indian Market Data",
-        "monthly_emi": monthly,
-        "min_emi": calculate_emi(pricing["min_price"]),
-        "max_emi": calculate_emi(pricing["max_price"])
-    }
+def emi_grid(price: int, down_payments, terms, aprs) -> np.ndarray:
+    """
+    EMIs for every (down payment, term, APR) combination in one vectorized call.
+    Returns an int array of shape (len(down_payments), len(terms), len(aprs)).
+    """
+    down_payments = np.asarray(down_payments, dtype=float)
+    months = np.asarray(terms, dtype=float)[:, None]
+    rates = np.asarray(aprs, dtype=float)[None, :] / (12 * 100)
 
+    growth = (1 + rates) ** months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factors = np.where(rates == 0, 1 / months, rates * growth / (growth - 1))
 
-def get_source_2(make: str, model: str, year: int) -> dict:
-    """Source 2: Dealer Network (5% higher)"""
-    
-    pricing = calculate_price(make, year)
-    dealer_price = int(pricing["vehicle_price"] * 1.05)
-    monthly = calculate_emi(dealer_price)
-    
-    print(f"📊 Source 2 (Dealer): {make} {model} {year} → ₹{monthly:,}/month")
-    
+    principal = max(price, 0) * (1 - down_payments)
+    return (principal[:, None, None] * factors[None, :, :]).astype(int)
+
+
+def quote_emis(source: str, pricing: dict, markup: float = 1.0) -> dict:
+    """EMIs for a source's price band (markup scales every price, e.g. dealer margin)"""
     return {
-        "source": "Dealer Network",
-        "monthly_emi": monthly,
-        "min_emi": calculate_emi(int(pricing["min_price"] * 1.05)),
-        "max_emi": calculate_emi(int(pricing["max_price"] * 1.05))
+        "source": source,
+        "monthly_emi": calculate_emi(int(pricing["vehicle_price"] * markup)),
+        "min_emi": calculate_emi(int(pricing["min_price"] * markup)),
+        "max_emi": calculate_emi(int(pricing["max_price"] * markup))
     }
 
 
@@ -150,7 +164,10 @@ def get_recommendation(source1_emi: int, source2_emi: int, contract_emi: int) ->
     
     savings = contract_emi - target
     
-    print(f"✅ Verdict: {verdict} | Market: ₹{market_avg:,} | Contract: ₹{contract_emi:,} | Savings: ₹{savings:,}")
+    logger.debug(
+        "Verdict: %s | Market: ₹%s | Contract: ₹%s | Savings: ₹%s",
+        verdict, market_avg, contract_emi, savings
+    )
     
     return {
         "verdict": verdict,
@@ -0,0 +1,172 @@
+import os
+import csv
+import time
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from price_engine import calculate_price, quote_emis, PRICE_SEED, DEPRECIATION_RATE, CURRENT_YEAR
+
+# =========================
+# CONFIG
+# =========================
+
+MARKET_PRICES_FILE = os.getenv(
+    "MARKET_PRICES_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "market_prices.csv")
+)
+
+# Seconds a single provider may take before it is left out of the comparison
+PRICE_PROVIDER_TIMEOUT = float(os.getenv("PRICE_PROVIDER_TIMEOUT", 2.0))
+PRICE_PROVIDER_WORKERS = int(os.getenv("PRICE_PROVIDER_WORKERS", 8))
+
+_provider_pool = ThreadPoolExecutor(max_workers=PRICE_PROVIDER_WORKERS, thread_name_prefix="price")
+
+
+# =========================
+# PROVIDERS
+# =========================
+
+class PriceProvider(ABC):
+    """
+    A market price source. quote() returns {"vehicle_price", "min_price",
+    "max_price"} or None when the provider has no price for the vehicle.
+    markup scales the quote when it is turned into EMIs (e.g. dealer margin).
+    """
+
+    def __init__(self, name, markup=1.0, timeout=PRICE_PROVIDER_TIMEOUT):
+        self.name = name
+        self.markup = markup
+        self.timeout = timeout
+
+    @abstractmethod
+    def quote(self, make, model, year):
+        ...
+
+
+class FormulaProvider(PriceProvider):
+    """Brand base price, depreciation and seeded market variation (price_engine)"""
+
+    def __init__(self, name, markup=1.0, seed=PRICE_SEED, timeout=PRICE_PROVIDER_TIMEOUT):
+        super().__init__(name, markup, timeout)
+        self.seed = seed
+
+    def quote(self, make, model, year):
+        return calculate_price(make, year, model, self.seed)
+
+
+class MarketDataProvider(PriceProvider):
+    """
+    Price bands from a local make/model/year CSV, loaded once into a
+    (make, model) -> sorted years index. A missing year uses the nearest
+    listed year, adjusted by the standard depreciation rate; an unknown
+    model goes to the fallback provider (if any).
+    """
+
+    def __init__(self, name, path=MARKET_PRICES_FILE, fallback=None, markup=1.0,
+                 timeout=PRICE_PROVIDER_TIMEOUT):
+        super().__init__(name, markup, timeout)
+        self.path = path
+        self.fallback = fallback
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        index = {}
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                key = (row["make"].strip().lower(), row["model"].strip().lower())
+                index.setdefault(key, []).append(
+                    (int(row["year"]), int(row["min_price"]), int(row["max_price"]))
+                )
+
+        for key, rows in index.items():
+            rows.sort()
+            index[key] = ([r[0] for r in rows], [(r[1], r[2]) for r in rows])
+        return index
+
+    def index(self):
+        with self._lock:
+            if self._index is None:
+                self._index = self._load()
+            return self._index
+
+    def quote(self, make, model, year):
+        entry = self.index().get(((make or "").strip().lower(), (model or "").strip().lower()))
+        if entry is None:
+            return self.fallback.quote(make, model, year) if self.fallback else None
+
+        years, bands = entry
+        year = min(year, CURRENT_YEAR)
+        i = bisect_left(years, year)
+        if i == len(years) or (i > 0 and year - years[i - 1] < years[i] - year):
+            i -= 1
+
+        # Older than the listed year -> cheaper, newer -> dearer
+        factor = (1 - DEPRECIATION_RATE) ** (years[i] - year)
+        min_price, max_price = int(bands[i][0] * factor), int(bands[i][1] * factor)
+        return {
+            "vehicle_price": (min_price + max_price) // 2,
+            "min_price": min_price,
+            "max_price": max_price
+        }
+
+
+class DerivedProvider(PriceProvider):
+    """Another provider's price band under its own name and markup"""
+
+    def __init__(self, name, source, markup=1.0, timeout=PRICE_PROVIDER_TIMEOUT):
+        super().__init__(name, markup, timeout)
+        self.source = source
+
+    def quote(self, make, model, year):
+        return self.source.quote(make, model, year)
+
+
+_market = MarketDataProvider("Indian Market Data", fallback=FormulaProvider("Indian Market Data"))
+
+# Dealers quote the market band plus their 5% margin
+DEFAULT_PROVIDERS = [
+    _market,
+    DerivedProvider("Dealer Network", _market, markup=1.05),
+]
+
+
+# =========================
+# CONCURRENT QUERY
+# =========================
+
+def query_providers(make, model, year, providers=None):
+    """
+    Ask every provider at once; each gets its own timeout, measured from the
+    start of the query. Returns (sources, unavailable): EMI quotes in provider
+    order, and {"source", "error"} for providers that failed or timed out.
+    """
+    providers = providers or DEFAULT_PROVIDERS
+    started = time.monotonic()
+    futures = [(p, _provider_pool.submit(p.quote, make, model, year)) for p in providers]
+
+    sources = []
+    unavailable = []
+    for provider, future in futures:
+        remaining = provider.timeout - (time.monotonic() - started)
+        try:
+            pricing = future.result(timeout=max(remaining, 0))
+        except FutureTimeout:
+            unavailable.append({"source": provider.name, "error": "timeout"})
+            continue
+        except Exception as e:
+            unavailable.append({"source": provider.name, "error": f"{type(e).__name__}: {e}"})
+            continue
+
+        if not pricing or pricing["vehicle_price"] <= 0:
+            unavailable.append({"source": provider.name, "error": "no price"})
+            continue
+        sources.append(quote_emis(provider.name, pricing, provider.markup))
+
+    return sources, unavailable
+
+
+def shutdown_providers():
+    _provider_pool.shutdown(wait=False, cancel_futures=True)
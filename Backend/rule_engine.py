@@ -0,0 +1,250 @@
+import os
+import re
+import json
+import time
+import threading
+from bisect import bisect_left, bisect_right
+
+# =========================
+# CONFIG
+# =========================
+
+FAIRNESS_RULES_FILE = os.getenv(
+    "FAIRNESS_RULES_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fairness_rules.json")
+)
+
+# How often (seconds) workers check the rules file for changes
+RULES_RELOAD_INTERVAL = float(os.getenv("RULES_RELOAD_INTERVAL", 2.0))
+
+_NUMBER = re.compile(r"\d+(\.\d+)?")
+
+
+# =========================
+# COMPILED RULES
+# =========================
+# Every rule maps an SLA dict to an outcome code; points[code] and
+# reasons[code] give its contribution. Code 0 is "missing" where a rule has one.
+
+class BracketRule:
+    """Numeric field scored by which (inclusive) upper bound it falls under"""
+
+    def __init__(self, spec, missing_pattern):
+        brackets = spec["brackets"]
+        if brackets[-1]["max"] is not None:
+            raise ValueError(f"Rule '{spec['name']}': last bracket must have max null")
+
+        self.name = spec["name"]
+        self.field = spec["field"]
+        self.bounds = [float(b["max"]) for b in brackets[:-1]]
+        self.points = [spec["missing"]["points"]] + [b["points"] for b in brackets]
+        self.reasons = [spec["missing"]["reason"]] + [b["reason"] for b in brackets]
+        self._missing = missing_pattern
+
+    def parse(self, sla_data):
+        text = sla_data.get(self.field, {}).get("value")
+        if not text or self._missing.search(text):
+            return None
+        match = _NUMBER.search(text)
+        return float(match.group()) if match else None
+
+    def code(self, sla_data):
+        number = self.parse(sla_data)
+        return 0 if number is None else bisect_left(self.bounds, number) + 1
+
+
+class ClauseRule:
+    """Text field scored by the first matcher that applies"""
+
+    def __init__(self, spec, missing_pattern):
+        self.name = spec["name"]
+        self.field = spec["field"]
+        self.matchers = [
+            re.compile(re.escape(m["contains"]), re.IGNORECASE if m.get("ignore_case") else 0)
+            for m in spec["matchers"]
+        ]
+        outcomes = [spec["missing"]] + spec["matchers"] + [spec["default"]]
+        self.points = [o["points"] for o in outcomes]
+        self.reasons = [o["reason"] for o in outcomes]
+        self._missing = missing_pattern
+
+    def code(self, sla_data):
+        text = sla_data.get(self.field, {}).get("value")
+        if not text or self._missing.search(text):
+            return 0
+        for i, matcher in enumerate(self.matchers, start=1):
+            if matcher.search(text):
+                return i
+        return len(self.matchers) + 1
+
+
+class UnclearCountRule:
+    """Scored by how many SLA fields are missing or left blank"""
+
+    def __init__(self, spec, missing_markers, unclear_markers):
+        brackets = spec["brackets"]
+        if brackets[-1]["max"] is not None:
+            raise ValueError(f"Rule '{spec['name']}': last bracket must have max null")
+
+        self.name = spec["name"]
+        self.bounds = [b["max"] for b in brackets[:-1]]
+        self.points = [b["points"] for b in brackets]
+        self.reasons = [b["reason"] for b in brackets]
+        self._missing_values = [None] + list(missing_markers)
+        self._unclear = re.compile(
+            "|".join(re.escape(m) for m in unclear_markers) if unclear_markers else r"(?!)"
+        )
+
+    def count(self, sla_data):
+        missing_values = self._missing_values
+        unclear = self._unclear.search
+        count = 0
+        for v in sla_data.values():
+            value = v.get("value")
+            if value in missing_values or unclear(str(value)):
+                count += 1
+        return count
+
+    def code(self, sla_data):
+        return bisect_left(self.bounds, self.count(sla_data))
+
+
+class CompiledRules:
+    """A rules config compiled into bracket tables and precompiled matchers"""
+
+    def __init__(self, config, version=1):
+        self.version = version
+        self.max_score = config.get("max_score", 100)
+
+        missing_markers = config.get("missing_markers", [])
+        missing_pattern = re.compile(
+            "|".join(re.escape(m) for m in missing_markers) if missing_markers else r"(?!)"
+        )
+
+        self.rules = []
+        for spec in config["rules"]:
+            if spec["type"] == "bracket":
+                self.rules.append(BracketRule(spec, missing_pattern))
+            elif spec["type"] == "clause":
+                self.rules.append(ClauseRule(spec, missing_pattern))
+            elif spec["type"] == "unclear_count":
+                self.rules.append(UnclearCountRule(
+                    spec, missing_markers, config.get("unclear_markers", [])
+                ))
+            else:
+                raise ValueError(f"Unknown rule type: {spec['type']}")
+
+        levels = sorted(config["levels"], key=lambda l: l["min_score"])
+        self.level_minimums = [l["min_score"] for l in levels]
+        self.level_names = [l["level"] for l in levels]
+
+    def level_for(self, score):
+        return self.level_names[max(0, bisect_right(self.level_minimums, score) - 1)]
+
+
+# =========================
+# ENGINE (HOT-RELOADING)
+# =========================
+
+class RuleEngine:
+    """
+    Scores SLA data with rules loaded from a JSON file.
+    The file is re-checked every reload_interval seconds and recompiled when it
+    changes, so running workers pick up new rules without a restart. A file that
+    fails to compile is reported in stats() and the previous rules stay active.
+    """
+
+    def __init__(self, path=FAIRNESS_RULES_FILE, reload_interval=RULES_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        self._mtime = os.path.getmtime(path)
+        self._rules = self._load(version=1)
+        self._loaded_at = time.time()
+        self._reset_counts()
+
+    def _load(self, version):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return CompiledRules(json.load(f), version)
+
+    def _reset_counts(self):
+        self._scored = 0
+        self._counts = {rule.name: [0] * len(rule.reasons) for rule in self._rules.rules}
+        self._outcomes = {}  # tuple of per-rule codes -> records scored by score()
+
+    def rules(self) -> CompiledRules:
+        """Current compiled rules, reloading the file first if it changed"""
+        now = time.monotonic()
+        if now - self._checked_at >= self.reload_interval:
+            with self._lock:
+                self._checked_at = now
+                try:
+                    mtime = os.path.getmtime(self.path)
+                    if mtime != self._mtime:
+                        self._mtime = mtime
+                        self._rules = self._load(self._rules.version + 1)
+                        self._loaded_at = time.time()
+                        self.last_error = None
+                        self._reset_counts()
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    self.last_error = f"{type(e).__name__}: {e}"
+        return self._rules
+
+    def record_batch(self, rules, counts_per_rule, records):
+        """Add outcome counts (one list per rule, indexed by code) for a batch"""
+        with self._lock:
+            if rules is not self._rules:
+                return  # scored with rules that were just replaced
+            self._scored += records
+            for rule, counts in zip(rules.rules, counts_per_rule):
+                totals = self._counts[rule.name]
+                for code, n in enumerate(counts):
+                    totals[code] += int(n)
+
+    def score(self, sla_data):
+        rules = self.rules()
+        score = 0
+        codes = []
+        for rule in rules.rules:
+            code = rule.code(sla_data)
+            codes.append(code)
+            score += rule.points[code]
+        score = min(score, rules.max_score)
+
+        # One counter bump per call; per-rule totals are derived in stats()
+        codes = tuple(codes)
+        with self._lock:
+            if rules is self._rules:
+                self._outcomes[codes] = self._outcomes.get(codes, 0) + 1
+
+        return {
+            "fairness_score": score,
+            "fairness_level": rules.level_for(score),
+            "reasons": [rule.reasons[code] for rule, code in zip(rules.rules, codes)]
+        }
+
+    def stats(self):
+        with self._lock:
+            counts = {name: list(totals) for name, totals in self._counts.items()}
+            scored = self._scored
+            for codes, n in self._outcomes.items():
+                scored += n
+                for rule, code in zip(self._rules.rules, codes):
+                    counts[rule.name][code] += n
+
+            return {
+                "path": self.path,
+                "version": self._rules.version,
+                "loaded_at": self._loaded_at,
+                "last_error": self.last_error,
+                "records_scored": scored,
+                "evaluations": {
+                    rule.name: dict(zip(rule.reasons, counts[rule.name]))
+                    for rule in self._rules.rules
+                }
+            }
+
+
+default_engine = RuleEngine()
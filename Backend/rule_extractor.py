@@ -0,0 +1,244 @@
+import os
+import re
+import json
+import glob
+import time
+
+# =========================
+# CONFIG
+# =========================
+
+# Fields at or above this confidence are not sent to Gemini
+SLA_RULE_MIN_CONFIDENCE = float(os.getenv("SLA_RULE_MIN_CONFIDENCE", 0.8))
+
+# Same schema the Gemini prompt asks for (field -> JSON value type)
+SLA_FIELDS = {
+    "interest_rate_apr": "string|null",
+    "late_fee_penalty": "string|null",
+    "termination_clause": "string|null",
+    "down_payment": "string|null",
+    "emi_amount": "number|null",
+    "insurance_mandatory": "boolean|null",
+    "processing_fees": "string|null",
+}
+
+_CURRENCY = r"(?P<currency>₹|\brs\.?|\binr\b|\$)"
+_AMOUNT = _CURRENCY + r"?\s*(?P<amount>\d[\d,]*(?:\.\d+)?)"
+# Amounts that must carry a currency marker ("due on the 5th" is not an EMI)
+_CURRENCY_AMOUNT = _CURRENCY + r"\s*(?P<amount>\d[\d,]*(?:\.\d+)?)"
+
+# A "no"/"not" this close before a boolean match (same clause) negates it
+NEGATION_WINDOW = 30
+_NEGATION = re.compile(r"\b(?:no|not)\b[^.;\n]*$", re.IGNORECASE)
+
+
+# =========================
+# COMPILED PATTERNS
+# =========================
+# Each field has (pattern, confidence, value builder) entries, strongest first.
+
+def _rate(m):
+    suffix = " per annum" if m.group("pa") else ""
+    return f"{m.group('rate')}%{suffix}"
+
+
+def _number(m):
+    return float(m.group("amount").replace(",", ""))
+
+
+def _amount_text(m):
+    """
+    Amount with its unit, digit grouping removed so the scorer reads the whole
+    number: "Rs. 3,00,000" -> "₹300000", "20 %" -> "20%", bare "3,00,000" -> "300000"
+    """
+    amount = m.group("amount").replace(",", "")
+    if m.group(0).rstrip().endswith("%"):
+        return f"{amount}%"
+    if m.groupdict().get("currency"):
+        return f"₹{amount}"
+    return amount
+
+
+def _snippet(m):
+    return re.sub(r"\s+", " ", m.group(0)).strip()
+
+
+def _true(m):
+    return True
+
+
+_RULES = {
+    "interest_rate_apr": [
+        (r"(?:annual percentage rate|\bapr\b)[^\n\d]{0,30}(?P<rate>\d{1,2}(?:\.\d+)?)\s*%(?P<pa>\s*(?:per annum|p\.?a\.?))?", 0.95, _rate),
+        (r"(?:rate of interest|interest rate)[^\n\d]{0,30}(?P<rate>\d{1,2}(?:\.\d+)?)\s*%(?P<pa>\s*(?:per annum|p\.?a\.?))?", 0.9, _rate),
+        (r"interest[^\n]{0,60}?(?P<rate>\d{1,2}(?:\.\d+)?)\s*%(?P<pa>\s*(?:per annum|p\.?a\.?))?", 0.6, _rate),
+    ],
+    "emi_amount": [
+        (r"(?:monthly emi|emi amount|monthly instal(?:l)?ment|monthly payment)[^\n\d]{0,30}" + _CURRENCY_AMOUNT, 0.9, _number),
+        (r"(?:monthly emi|emi amount|monthly instal(?:l)?ment|monthly payment)[^\n\d]{0,30}(?P<amount>\d{1,3}(?:,\d{2,3})+|\d{4,})\b", 0.7, _number),
+        (r"\bemi\b[^\n\d]{0,20}" + _AMOUNT, 0.6, _number),
+    ],
+    "down_payment": [
+        # A unit (currency or %) is required for a confident answer; a bare
+        # amount ("Down Payment = (3,00,000)") is left for the LLM to confirm
+        (r"down ?payment[^\n\d]{0,40}?\(?" + _CURRENCY_AMOUNT, 0.85, _amount_text),
+        (r"down ?payment[^\n\d]{0,40}?\(?(?P<amount>\d[\d,]*(?:\.\d+)?)\s*%", 0.85, _amount_text),
+        (r"down ?payment[^\n\d]{0,40}?\(?" + _AMOUNT + r"(?:\s*%)?", 0.6, _amount_text),
+        (r"margin money[^\n\d]{0,40}?" + _AMOUNT + r"(?:\s*%)?", 0.7, _amount_text),
+    ],
+    "processing_fees": [
+        (r"processing (?:fee|fees|charges?)[^\n\d]{0,30}" + _AMOUNT + r"(?:\s*\([^)\n]{0,40}\))?", 0.9, _snippet),
+    ],
+    "late_fee_penalty": [
+        (r"late (?:payment )?(?:fee|charge)s?[^\n]{0,20}?" + _AMOUNT + r"[^\n]{0,40}", 0.85, _snippet),
+        # Often a cut-off table cell ("1% penal interest per annum on"): a hint, not an answer
+        (r"\d+(?:\.\d+)?\s*%\s*penal interest[^\n]{0,60}", 0.7, _snippet),
+        (r"penal(?:ty| interest)[^\n]{0,80}", 0.5, _snippet),
+    ],
+    "termination_clause": [
+        (r"(?:early termination|foreclosure|pre-?closure|full prepayment)[^\n]{0,120}", 0.6, _snippet),
+    ],
+    "insurance_mandatory": [
+        (r"insurance (?:is |shall be )?(?:mandatory|compulsory|required)", 0.9, _true),
+        (r"(?:must|shall) (?:maintain|obtain|keep)[^\n]{0,40}insurance", 0.85, _true),
+    ],
+}
+
+_COMPILED_RULES = {
+    field: [(re.compile(pattern, re.IGNORECASE), confidence, build)
+            for pattern, confidence, build in rules]
+    for field, rules in _RULES.items()
+}
+
+
+# =========================
+# EXTRACTION
+# =========================
+
+def _negated(text, start):
+    """True if a "no"/"not" sits in the same clause just before start"""
+    return _NEGATION.search(text, max(0, start - NEGATION_WINDOW), start) is not None
+
+
+def _first_match(pattern, field, ocr_text):
+    """First match of the pattern; boolean fields skip negated matches"""
+    for match in pattern.finditer(ocr_text):
+        if SLA_FIELDS[field] != "boolean|null" or not _negated(ocr_text, match.start()):
+            return match
+    return None
+
+
+def extract_sla_rules(ocr_text: str):
+    """
+    Fill the SLA schema from standard contract phrasing, with a confidence per field.
+    Unmatched fields are {"value": None, "confidence": 0.0}.
+    """
+    result = {}
+    for field in SLA_FIELDS:
+        result[field] = {"value": None, "confidence": 0.0}
+        for pattern, confidence, build in _COMPILED_RULES[field]:
+            match = _first_match(pattern, field, ocr_text)
+            if match:
+                result[field] = {"value": build(match), "confidence": confidence}
+                break
+    return result
+
+
+def unresolved_fields(rule_data):
+    """Fields that still need the LLM"""
+    return [
+        field for field in SLA_FIELDS
+        if rule_data[field]["value"] is None
+        or rule_data[field]["confidence"] < SLA_RULE_MIN_CONFIDENCE
+    ]
+
+
+# =========================
+# BENCHMARK
+# =========================
+
+def load_corpus(patterns):
+    """(name, OCR text) for plain-text OCR outputs and OCR cache entries (.json)"""
+    documents = []
+    for path in sorted({p for pattern in patterns for p in glob.glob(pattern)}):
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".json"):
+                try:
+                    text = json.load(f)["ocr_text"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+            else:
+                text = f.read()
+        documents.append((os.path.basename(path), text))
+    return documents
+
+
+def benchmark(documents, model):
+    """
+    Time SLA extraction per document against a stub model (fake_llm): every
+    field from the model vs. rules first and the model only for what is left.
+    Both paths make real (stubbed) calls, so the savings are measured.
+    """
+    from chunk_selector import select_relevant_chunks, estimate_tokens
+    from llm_engine import _sla_prompt
+
+    calls_avoided = 0
+    fields_resolved = 0
+    llm_only_seconds = 0.0
+    rules_first_seconds = 0.0
+    llm_only_tokens = 0
+    rules_first_tokens = 0
+
+    for name, text in documents:
+        prompt = _sla_prompt(text, list(SLA_FIELDS))
+        start = time.perf_counter()
+        model.generate_content(prompt)
+        llm_only_seconds += time.perf_counter() - start
+        llm_only_tokens += estimate_tokens(prompt)
+
+        start = time.perf_counter()
+        missing = unresolved_fields(extract_sla_rules(text))
+        if missing:
+            contract_text, _ = select_relevant_chunks(text, fields=missing)
+            prompt = _sla_prompt(contract_text, missing)
+            model.generate_content(prompt)
+            rules_first_tokens += estimate_tokens(prompt)
+        else:
+            calls_avoided += 1
+        rules_first_seconds += time.perf_counter() - start
+
+        fields_resolved += len(SLA_FIELDS) - len(missing)
+        print(f"{name}: {len(SLA_FIELDS) - len(missing)}/{len(SLA_FIELDS)} fields by rules, LLM needed for {missing}")
+
+    count = len(documents)
+    return {
+        "documents": count,
+        "llm_calls_avoided": calls_avoided,
+        "fields_resolved_by_rules": f"{fields_resolved}/{count * len(SLA_FIELDS)}",
+        "llm_only_seconds": round(llm_only_seconds, 2),
+        "rules_first_seconds": round(rules_first_seconds, 2),
+        "latency_saved_seconds": round(llm_only_seconds - rules_first_seconds, 2),
+        "prompt_tokens_llm_only": llm_only_tokens,
+        "prompt_tokens_rules_first": rules_first_tokens,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    os.environ.setdefault("LLM_BACKEND", "fake")  # llm_engine needs no Gemini key here
+    from fake_llm import FakeModel, FAKE_LLM_FIRST_TOKEN_SECONDS, FAKE_LLM_CHUNK_SECONDS
+
+    parser = argparse.ArgumentParser(description="Benchmark the rule-based SLA extractor against a stub LLM")
+    parser.add_argument("--corpus", nargs="+",
+                        default=["output/*.txt", os.path.join("runtime_data", "ocr_cache", "*.json")],
+                        help="globs of OCR text files and/or OCR cache entries")
+    parser.add_argument("--first-token", type=float, default=FAKE_LLM_FIRST_TOKEN_SECONDS,
+                        help="stub model first-token latency (seconds)")
+    parser.add_argument("--chunk", type=float, default=FAKE_LLM_CHUNK_SECONDS,
+                        help="stub model per-chunk latency (seconds)")
+    args = parser.parse_args()
+
+    documents = load_corpus(args.corpus)
+    model = FakeModel(first_token_latency=args.first_token, chunk_latency=args.chunk)
+    for key, value in benchmark(documents, model).items():
+        print(f"{key}: {value}")
@@ -0,0 +1,156 @@
+import numpy as np
+
+from rule_engine import default_engine, BracketRule, UnclearCountRule
+
+# =========================
+# VECTORIZED SCORING
+# =========================
+# Uses the same compiled rules as Score.calculate_fairness_score (rule_engine),
+# so a hot-reloaded fairness_rules.json applies to both paths.
+
+def _tables(rules):
+    """numpy copies of each rule's tables, cached on the compiled rules object"""
+    tables = getattr(rules, "_numpy_tables", None)
+    if tables is None:
+        tables = [
+            (np.asarray(getattr(rule, "bounds", []), dtype=float), np.asarray(rule.points))
+            for rule in rules.rules
+        ]
+        tables.append((np.asarray(rules.level_minimums), np.asarray(rules.level_names)))
+        rules._numpy_tables = tables
+    return tables
+
+
+def records_to_columns(records, rules=None):
+    """
+    Turn SLA dicts into one column per rule:
+    bracket rules -> parsed numbers (NaN = not specified),
+    unclear-count rules -> counts, clause rules -> outcome codes.
+    Counts and codes are integer columns even when there are no records.
+    """
+    rules = rules or default_engine.rules()
+    columns = {}
+    for rule in rules.rules:
+        if isinstance(rule, BracketRule):
+            values = [rule.parse(sla_data) for sla_data in records]
+            columns[rule.name] = np.array([np.nan if v is None else v for v in values])
+        elif isinstance(rule, UnclearCountRule):
+            columns[rule.name] = np.array([rule.count(sla_data) for sla_data in records], dtype=np.intp)
+        else:
+            columns[rule.name] = np.array([rule.code(sla_data) for sla_data in records], dtype=np.intp)
+    return columns
+
+
+def score_columns(columns, rules=None):
+    """
+    Score whole columns at once (see records_to_columns for the column format).
+    Returns {"scores", "levels", "reason_codes"}; reason_codes has one column
+    per rule, indexing that rule's reasons.
+    """
+    rules = rules or default_engine.rules()
+    tables = _tables(rules)
+
+    codes = []
+    scores = 0
+    for rule, (bounds, points) in zip(rules.rules, tables):
+        values = columns[rule.name]
+        if isinstance(rule, BracketRule):
+            values = np.asarray(values, dtype=float)
+            missing = np.isnan(values)
+            code = np.searchsorted(bounds, np.where(missing, 0, values), side="left") + 1
+            code = np.where(missing, 0, code)
+        elif isinstance(rule, UnclearCountRule):
+            code = np.searchsorted(bounds, np.asarray(values, dtype=np.intp), side="left")
+        else:
+            code = np.asarray(values, dtype=np.intp)
+        codes.append(code)
+        scores = scores + points[code]
+
+    scores = np.minimum(scores, rules.max_score)
+    level_minimums, level_names = tables[-1]
+    level_index = np.maximum(np.searchsorted(level_minimums, scores, side="right") - 1, 0)
+
+    default_engine.record_batch(
+        rules,
+        [np.bincount(code, minlength=len(rule.reasons)) for rule, code in zip(rules.rules, codes)],
+        len(scores)
+    )
+
+    return {
+        "scores": scores,
+        "levels": level_names[level_index],
+        "reason_codes": np.column_stack(codes),
+    }
+
+
+def calculate_fairness_scores(records):
+    """Score a batch of SLA dicts; same inputs as Score.calculate_fairness_score"""
+    rules = default_engine.rules()
+    if not records:
+        return {
+            "scores": np.zeros(0, dtype=np.intp),
+            "levels": np.asarray(rules.level_names)[:0],
+            "reason_codes": np.zeros((0, len(rules.rules)), dtype=np.intp),
+        }
+    return score_columns(records_to_columns(records, rules), rules)
+
+
+def to_results(batch, rules=None):
+    """Expand a batch result into the per-record dicts the scalar scorer returns"""
+    rules = rules or default_engine.rules()
+    return [
+        {
+            "fairness_score": int(score),
+            "fairness_level": str(level),
+            "reasons": [rule.reasons[code] for rule, code in zip(rules.rules, codes)]
+        }
+        for score, level, codes in zip(batch["scores"], batch["levels"], batch["reason_codes"])
+    ]
+
+
+# =========================
+# BENCHMARK
+# =========================
+
+def random_record(rng):
+    """A random SLA dict mixing specified, missing and unclear values"""
+    def pick(*options):
+        return {"value": rng.choice(options), "confidence": 0.9}
+    return {
+        "interest_rate_apr": pick(None, "Not specified", f"{rng.uniform(3, 20):.2f}% per annum",
+                                  "7%", "10", "14.0", "Rate: ______"),
+        "late_fee_penalty": pick(None, "Not specified", "₹500 per day", "______ per month"),
+        "termination_clause": pick(None, "Not specified", "Early termination allowed", "Not permitted"),
+        "down_payment": pick(None, "Not specified", f"{rng.randint(0, 60)}%", "20", "40.0"),
+        "emi_amount": pick(None, 23648.0),
+        "insurance_mandatory": pick(None, True, False),
+        "processing_fees": pick(None, "Not specified", "1.1% of loan amount"),
+    }
+
+
+if __name__ == "__main__":
+    import time
+    import random
+    from Score import calculate_fairness_score
+
+    rng = random.Random(7)
+    records = [random_record(rng) for _ in range(100_000)]
+
+    start = time.perf_counter()
+    scalar = [calculate_fairness_score(r) for r in records]
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculate_fairness_scores(records)
+    batch_seconds = time.perf_counter() - start
+
+    columns = records_to_columns(records)
+    start = time.perf_counter()
+    score_columns(columns)
+    columns_seconds = time.perf_counter() - start
+
+    print(f"records:               {len(records):,}")
+    print(f"scalar loop:           {scalar_seconds:.3f}s")
+    print(f"batch (from dicts):    {batch_seconds:.3f}s ({scalar_seconds / batch_seconds:.1f}x)")
+    print(f"batch (from columns):  {columns_seconds:.4f}s ({scalar_seconds / columns_seconds:.0f}x)")
+    print(f"results identical to scalar scorer: {to_results(batch) == scalar}")
@@ -0,0 +1,129 @@
+import os
+import time
+import json
+import threading
+from collections import OrderedDict
+
+# =========================
+# CONFIG
+# =========================
+
+NEGOTIATION_SESSION_TTL_SECONDS = int(os.getenv("NEGOTIATION_SESSION_TTL_SECONDS", 2 * 3600))
+NEGOTIATION_MAX_SESSIONS = int(os.getenv("NEGOTIATION_MAX_SESSIONS", 1024))
+
+
+# =========================
+# NEGOTIATION SESSION STORE
+# =========================
+
+class NegotiationSessionStore:
+    """
+    Per-conversation negotiation state, so clients send only what changed.
+    A session holds contract_context and negotiation_context dicts (deltas are
+    merged in) and the parsed contract analysis used by /chat.
+    Sessions expire ttl_seconds after last use; beyond max_sessions the least
+    recently used are evicted. Also counts per-turn payload bytes and JSON
+    parse time so the effect of sending deltas can be measured.
+    """
+
+    def __init__(self, ttl_seconds=NEGOTIATION_SESSION_TTL_SECONDS, max_sessions=NEGOTIATION_MAX_SESSIONS):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # conversation_id -> (session, expires_at)
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.expired = 0
+        self._turns = {}  # endpoint -> {"turns", "payload_bytes", "parse_seconds"}
+
+    @staticmethod
+    def _new_session():
+        return {"contract_context": {}, "negotiation_context": {}, "contract_analysis": None}
+
+    def get(self, conversation_id: str):
+        with self._lock:
+            entry = self._sessions.get(conversation_id)
+            if not entry:
+                return None
+            session, expires_at = entry
+            if expires_at <= time.time():
+                del self._sessions[conversation_id]
+                self.expired += 1
+                return None
+            self._touch(conversation_id, session)
+            return session
+
+    def update(self, conversation_id: str, contract_context: dict = None,
+               negotiation_context: dict = None, contract_analysis: dict = None, replace: bool = False):
+        """Merge deltas into a session (creating it if needed); replace starts it afresh"""
+        with self._lock:
+            entry = self._sessions.get(conversation_id)
+            session = entry[0] if entry and entry[1] > time.time() and not replace else self._new_session()
+            if contract_context:
+                session["contract_context"].update(contract_context)
+            if negotiation_context:
+                session["negotiation_context"].update(negotiation_context)
+            if contract_analysis is not None:
+                session["contract_analysis"] = contract_analysis
+            self._touch(conversation_id, session)
+            self._evict()
+            return session
+
+    def delete(self, conversation_id: str):
+        with self._lock:
+            return self._sessions.pop(conversation_id, None) is not None
+
+    def _touch(self, conversation_id, session):
+        self._sessions[conversation_id] = (session, time.time() + self.ttl_seconds)
+        self._sessions.move_to_end(conversation_id)
+
+    def _evict(self):
+        now = time.time()
+        # Oldest-used first, so stop at the first session that is still live
+        while self._sessions:
+            conversation_id, (_, expires_at) = next(iter(self._sessions.items()))
+            if expires_at > now:
+                break
+            del self._sessions[conversation_id]
+            self.expired += 1
+
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+    # ---------- per-turn metrics ----------
+
+    def _metrics(self, endpoint):
+        return self._turns.setdefault(endpoint, {"turns": 0, "payload_bytes": 0, "parse_seconds": 0.0})
+
+    def record_turn(self, endpoint: str, payload_bytes: int):
+        with self._lock:
+            metrics = self._metrics(endpoint)
+            metrics["turns"] += 1
+            metrics["payload_bytes"] += payload_bytes
+
+    def parse_json(self, endpoint: str, text: str):
+        """json.loads, with the time charged to endpoint's parse cost"""
+        start = time.perf_counter()
+        try:
+            return json.loads(text)
+        finally:
+            with self._lock:
+                self._metrics(endpoint)["parse_seconds"] += time.perf_counter() - start
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "evicted": self.evicted,
+                "expired": self.expired,
+                "turns": {
+                    endpoint: {
+                        "turns": t["turns"],
+                        "avg_payload_bytes": round(t["payload_bytes"] / t["turns"]) if t["turns"] else 0,
+                        "parse_ms_total": round(1000 * t["parse_seconds"], 3),
+                    }
+                    for endpoint, t in self._turns.items()
+                }
+            }
@@ -0,0 +1,30 @@
+import os
+import sys
+import tempfile
+
+# Backend modules import each other by bare name (as when run from Backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tests never reach Gemini: the gateway serves them from fake_llm
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+# main keeps caches and stores under ./runtime_data; keep them out of the tree
+os.chdir(tempfile.mkdtemp(prefix="backend-tests-"))
+
+
+import pytest
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """The shared gateway's fake model with no latency, plus a fresh breaker and instant retries"""
+    from llm_gateway import llm_gateway, CircuitBreaker
+
+    gateway = llm_gateway()
+    model = gateway.model
+    monkeypatch.setattr(model, "first_token_latency", 0.0)
+    monkeypatch.setattr(model, "chunk_latency", 0.0)
+    monkeypatch.setattr(model, "failure_rate", 0.0)
+    monkeypatch.setattr(gateway, "retry_base_seconds", 0.0)
+    monkeypatch.setattr(gateway, "breaker", CircuitBreaker())
+    return model
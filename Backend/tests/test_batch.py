@@ -0,0 +1,100 @@
+import os
+import json
+
+import pytest
+
+import batch
+from batch import discover_pdfs, write_parquet
+
+
+def test_manifest_entries_must_stay_inside_root(tmp_path):
+    root = tmp_path / "batch"
+    (root / "in").mkdir(parents=True)
+    (root / "in" / "a.pdf").write_bytes(b"%PDF")
+    outside = tmp_path / "secret.pdf"
+    outside.write_bytes(b"%PDF")
+
+    manifest = root / "manifest.txt"
+    manifest.write_text("in/a.pdf\n")
+    assert discover_pdfs(str(manifest), str(root)) == [os.path.realpath(root / "in" / "a.pdf")]
+
+    for entry in ("../secret.pdf", str(outside), json.dumps({"path": "in/../../secret.pdf"})):
+        manifest.write_text(entry + "\n")
+        with pytest.raises(ValueError):
+            discover_pdfs(str(manifest), str(root))
+
+
+def test_parquet_keeps_columns_of_every_row(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    checkpoint = tmp_path / "out.parquet.jsonl"
+    rows = [
+        {"path": "a.pdf", "status": "error", "error": "OCR failed"},
+        {"path": "b.pdf", "status": "ok", "sha256": "ab", "sla_extraction": {"emi_amount": 1}},
+    ]
+    checkpoint.write_text("\n".join(json.dumps(r) for r in rows) + "\n")
+
+    write_parquet(str(checkpoint), str(tmp_path / "out.parquet"))
+    table = pq.read_table(str(tmp_path / "out.parquet"))
+
+    assert set(table.column_names) == {"path", "status", "error", "sha256", "sla_extraction"}
+    assert table.to_pylist()[1]["sla_extraction"] == '{"emi_amount": 1}'
+    assert table.to_pylist()[1]["error"] is None
+
+
+@pytest.fixture
+def fake_stages(monkeypatch):
+    """OCR, SLA extraction and VIN lookup replaced; OCR of a PDF holding b"bad" fails"""
+    def ocr(path):
+        with open(path, "rb") as f:
+            if f.read() == b"bad":
+                raise RuntimeError("OCR failed")
+        return "contract text", []
+
+    monkeypatch.setattr(batch, "ocr_pdf_with_timings", ocr)
+    monkeypatch.setattr(batch, "extract_sla_fields", lambda text: {})
+    monkeypatch.setattr(batch, "extract_vin_and_vehicle_details",
+                        lambda text: {"vin": None, "vehicle_details": None})
+
+
+def test_resumed_run_keeps_last_record_per_path(tmp_path, fake_stages):
+    pq = pytest.importorskip("pyarrow.parquet")
+    source = tmp_path / "in"
+    source.mkdir()
+    (source / "a.pdf").write_bytes(b"bad")
+    (source / "b.pdf").write_bytes(b"%PDF-b")
+    output = str(tmp_path / "out.parquet")
+    cache = batch.OCRCache(str(tmp_path / "ocr_cache"))
+
+    first = batch.run_batch(str(source), output, ocr_cache=cache)
+    assert (first["ok"], first["errors"]) == (1, 1)
+
+    (source / "a.pdf").write_bytes(b"%PDF-a")
+    second = batch.run_batch(str(source), output, ocr_cache=cache)
+    assert (second["processed"], second["skipped_already_done"]) == (1, 1)
+    assert (second["ok"], second["errors"]) == (2, 0)
+
+    rows = pq.read_table(output).to_pylist()
+    assert sorted((os.path.basename(r["path"]), r["status"]) for r in rows) == [("a.pdf", "ok"), ("b.pdf", "ok")]
+
+
+def test_unreadable_pdf_is_an_error_row(tmp_path, fake_stages, monkeypatch):
+    source = tmp_path / "in"
+    source.mkdir()
+    (source / "a.pdf").write_bytes(b"%PDF-a")
+    (source / "b.pdf").write_bytes(b"%PDF-b")
+    unreadable = os.path.realpath(source / "a.pdf")
+
+    real_sha256 = batch._sha256
+    def sha256(path):
+        if path == unreadable:
+            raise PermissionError(13, "Permission denied", path)
+        return real_sha256(path)
+    monkeypatch.setattr(batch, "_sha256", sha256)
+
+    output = str(tmp_path / "out.jsonl")
+    summary = batch.run_batch(str(source), output, ocr_cache=batch.OCRCache(str(tmp_path / "ocr_cache")))
+    assert (summary["ok"], summary["errors"]) == (1, 1)
+
+    records = batch.latest_records(output)
+    assert records[unreadable]["status"] == "error"
+    assert "Permission denied" in records[unreadable]["error"]
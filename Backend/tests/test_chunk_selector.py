@@ -0,0 +1,30 @@
+from chunk_selector import CHUNK_MAX_CHARS, estimate_tokens, select_relevant_chunks, split_chunks
+
+CLAUSE = "The Borrower shall pay interest at 10.5% per annum; late payment attracts a penalty of Rs. 500."
+
+
+def test_oversized_paragraph_is_split_into_pieces():
+    # OCR output with no blank lines: one paragraph of ~29k characters
+    text = "[Page 1]\n" + " ".join([CLAUSE] * 300)
+    chunks = split_chunks(text)
+    assert len(chunks) > 1
+    assert all(len(chunk["text"]) <= CHUNK_MAX_CHARS for chunk in chunks)
+
+    selected, report = select_relevant_chunks(text, token_budget=2000)
+    assert report["chunks_selected"] > 0
+    assert "10.5% per annum" in selected
+    assert 0 < report["selected_tokens"] <= 2000
+
+
+def test_nothing_relevant_falls_back_to_truncated_text():
+    text = "[Page 1]\n" + "Lorem ipsum dolor sit amet. " * 1000
+    selected, report = select_relevant_chunks(text, token_budget=500)
+    assert report["chunks_selected"] == 0
+    assert text.startswith(selected)
+    assert selected.strip()
+    assert estimate_tokens(selected) <= 500
+
+
+def test_small_text_is_sent_whole():
+    text = "[Page 1]\n" + CLAUSE
+    assert select_relevant_chunks(text)[0] == text
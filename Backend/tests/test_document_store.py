@@ -0,0 +1,67 @@
+import os
+import time
+
+from document_store import DocumentStore
+
+
+def test_overflow_spills_to_disk_and_reloads(tmp_path):
+    store = DocumentStore(ttl_seconds=60, max_in_memory=1, spill_dir=str(tmp_path))
+    first = store.put("first contract")
+    second = store.put("second contract")
+
+    assert store.stats()["in_memory"] == 1
+    assert os.path.exists(store._spill_path(first))
+    assert store.get(first) == "first contract"
+    assert store.get(second) == "second contract"
+
+
+def test_spilled_document_keeps_its_original_expiry(tmp_path):
+    store = DocumentStore(ttl_seconds=60, max_in_memory=1, spill_dir=str(tmp_path))
+    first = store.put("first contract")
+    expires_at = store._documents[first][1]
+    store.put("second contract")
+
+    assert os.path.getmtime(store._spill_path(first)) == expires_at
+
+
+def test_spilled_document_expires(tmp_path):
+    store = DocumentStore(ttl_seconds=0.2, max_in_memory=1, spill_dir=str(tmp_path))
+    first = store.put("first contract")
+    time.sleep(0.1)
+    store.put("second contract")
+    time.sleep(0.15)
+
+    # Past the TTL counted from put(), not from when the file was written
+    assert store.get(first) is None
+    assert not os.path.exists(store._spill_path(first))
+
+
+def test_in_memory_document_expires(tmp_path):
+    store = DocumentStore(ttl_seconds=0.1, max_in_memory=4, spill_dir=str(tmp_path))
+    document_id = store.put("contract")
+    assert store.get(document_id) == "contract"
+    time.sleep(0.15)
+    assert store.get(document_id) is None
+
+
+def test_failed_spill_keeps_document_in_memory(tmp_path, monkeypatch):
+    store = DocumentStore(ttl_seconds=60, max_in_memory=1, spill_dir=str(tmp_path))
+    first = store.put("first contract")
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    second = store.put("second contract")
+
+    assert store.get(first) == "first contract"
+    assert store.get(second) == "second contract"
+    assert not store._spilling
+
+
+def test_without_spill_dir_overflow_is_dropped():
+    store = DocumentStore(ttl_seconds=60, max_in_memory=1, spill_dir="")
+    first = store.put("first contract")
+    second = store.put("second contract")
+    assert store.get(first) is None
+    assert store.get(second) == "second contract"
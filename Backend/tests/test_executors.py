@@ -0,0 +1,93 @@
+import time
+import asyncio
+import threading
+
+from executors import SharedSlots
+
+
+def test_threads_and_coroutines_share_the_limit():
+    slots = SharedSlots(1)
+    order = []
+
+    def hold():
+        with slots:
+            order.append("thread in")
+            time.sleep(0.1)
+            order.append("thread out")
+
+    async def run():
+        thread = threading.Thread(target=hold)
+        thread.start()
+        await asyncio.sleep(0.02)
+        async with slots:
+            order.append("coroutine in")
+        thread.join()
+
+    asyncio.run(run())
+    assert order == ["thread in", "thread out", "coroutine in"]
+    assert slots._free == 1
+
+
+def test_waiters_get_slots_in_arrival_order():
+    slots = SharedSlots(1)
+    order = []
+
+    async def waiter(name):
+        async with slots:
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        slots.__enter__()
+        tasks = []
+        for name in ("first", "second", "third"):
+            tasks.append(asyncio.create_task(waiter(name)))
+            await asyncio.sleep(0.01)
+        slots.release()
+        await asyncio.wait_for(asyncio.gather(*tasks), 1)
+
+    asyncio.run(run())
+    assert order == ["first", "second", "third"]
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    slots = SharedSlots(1)
+
+    async def run():
+        async with slots:
+            task = asyncio.create_task(slots.__aenter__())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        async with slots:
+            pass
+
+    asyncio.run(run())
+    assert slots._free == 1 and not slots._waiters
+
+
+def test_slot_is_handed_over_across_event_loops():
+    slots = SharedSlots(1)
+    running = []
+    peak = []
+
+    async def use():
+        async with slots:
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.02)
+            running.pop()
+
+    def loop_thread():
+        async def run():
+            await asyncio.gather(*(use() for _ in range(3)))
+        asyncio.run(run())
+
+    threads = [threading.Thread(target=loop_thread) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(peak) == 9 and max(peak) == 1
+    assert slots._free == 1
@@ -0,0 +1,34 @@
+import pytest
+
+from intent_router import LABELED_MESSAGES, classify_intent
+
+# Share of LABELED_MESSAGES the router must classify exactly as labeled
+MIN_ACCURACY = 1.0
+
+# Negation: an accept keyword right after a negator is a rejection, and
+# only an accept keyword that every negator precedes flips the intent
+NEGATED_MESSAGES = [
+    ("Not ok", "reject"),
+    ("not okay with that", "reject"),
+    ("No deal.", "reject"),
+    ("I don't agree with this", "reject"),
+    ("I dont accept", "reject"),
+    ("I cannot accept this", "reject"),
+    ("I can't agree to that", "reject"),
+    ("I will never agree", "reject"),
+    ("I won't accept it", "reject"),
+    ("No problem, I agree", "accept"),
+    ("Yes, no worries", "accept"),
+    ("Not ok at first, but ok now", "accept"),
+]
+
+
+def test_labeled_accuracy():
+    misses = [(m, e, classify_intent(m)) for m, e in LABELED_MESSAGES if classify_intent(m) != e]
+    accuracy = 1 - len(misses) / len(LABELED_MESSAGES)
+    assert accuracy >= MIN_ACCURACY, f"intent router accuracy {accuracy:.0%}, misses: {misses}"
+
+
+@pytest.mark.parametrize("message, intent", NEGATED_MESSAGES)
+def test_negated_acceptances(message, intent):
+    assert classify_intent(message) == intent
@@ -0,0 +1,94 @@
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from jobs import JobQueue
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A fresh job queue whose contract job runs two fake stages"""
+    release = threading.Event()
+
+    def fake_job(job, pdf_bytes):
+        with job.stage("ocr"):
+            release.wait(5)
+        with job.stage("scoring"):
+            pass
+        return {"pages": pdf_bytes.count(b"/Page")}
+
+    queue = JobQueue()
+    monkeypatch.setattr(main, "job_queue", queue)
+    monkeypatch.setattr(main, "_run_contract_job", fake_job)
+    client = TestClient(main.app)
+    client.release = release
+    yield client
+    release.set()
+    queue.shutdown()
+
+
+def events(response):
+    return [
+        (fields["event"], json.loads(fields["data"]))
+        for fields in (dict(line.split(": ", 1) for line in block.splitlines())
+                       for block in response.text.strip().split("\n\n"))
+    ]
+
+
+def submit(client):
+    response = client.post("/jobs", files={"file": ("contract.pdf", b"%PDF /Page /Page", "application/pdf")})
+    assert response.status_code == 200
+    return response.json()["job_id"]
+
+
+def test_submit_poll_and_stream(client):
+    job_id = submit(client)
+    assert client.get(f"/jobs/{job_id}").json()["status"] in ("queued", "running")
+
+    client.release.set()
+    names = [name for name, _ in events(client.get(f"/jobs/{job_id}/events"))]
+    assert names == ["queued", "running", "stage_started", "stage_completed",
+                     "stage_started", "stage_completed", "completed"]
+
+    status = client.get(f"/jobs/{job_id}").json()
+    assert status["status"] == "completed"
+    assert status["result"] == {"pages": 2}
+    assert [stage["name"] for stage in status["stages"]] == ["ocr", "scoring"]
+
+
+def test_unknown_job_is_404(client):
+    assert client.get("/jobs/nope").status_code == 404
+    assert client.get("/jobs/nope/events").status_code == 404
+
+
+def test_stream_ends_at_the_deadline(client, monkeypatch):
+    monkeypatch.setattr(main, "JOB_STREAM_TIMEOUT_SECONDS", 0.3)
+    job_id = submit(client)
+    name, data = events(client.get(f"/jobs/{job_id}/events"))[-1]
+    assert name == "timeout"
+    assert data["status"] == "running"
+
+
+def test_stream_ends_when_the_job_is_dropped(client):
+    job_id = submit(client)
+    queue = main.job_queue
+    threading.Timer(0.3, lambda: queue._jobs.pop(job_id)).start()
+    assert events(client.get(f"/jobs/{job_id}/events"))[-1][0] == "gone"
+
+
+def test_shutdown_fails_jobs_that_never_started():
+    queue = JobQueue()
+    blocker = threading.Event()
+    queue.backend = type(queue.backend)(workers=1)
+    running = queue.submit("x", lambda job: blocker.wait(5))
+    queued = queue.submit("x", lambda job: None)
+
+    queue.shutdown()
+    blocker.set()
+    assert queued.status == "failed"
+    assert "shutting down" in queued.error
+    assert queued.events[-1]["event"] == "failed"
+    assert running.status != "queued"
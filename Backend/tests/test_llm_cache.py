@@ -0,0 +1,37 @@
+import os
+import threading
+
+from llm_cache import LLMCache
+
+
+def test_concurrent_puts_of_one_prompt_all_succeed(tmp_path):
+    cache = LLMCache(disk_dir=str(tmp_path))
+    key = LLMCache.make_key("model", "same prompt")
+    errors = []
+    barrier = threading.Barrier(16)
+
+    def put(n):
+        barrier.wait()
+        try:
+            for _ in range(20):
+                cache.put(key, f'{{"answer": {n}}}')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=put, args=(n,)) for n in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(tmp_path) == [f"{key}.json"]
+    assert LLMCache(disk_dir=str(tmp_path)).get(key).startswith('{"answer": ')
+
+
+def test_disk_write_failure_keeps_the_memory_entry(tmp_path):
+    cache = LLMCache(disk_dir=str(tmp_path / "cache"))
+    os.rmdir(tmp_path / "cache")  # every disk write now fails
+
+    cache.put("key", "text")
+    assert cache.get("key") == "text"
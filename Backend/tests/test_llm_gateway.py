@@ -0,0 +1,147 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from executors import llm_slots
+from fake_llm import FakeModel
+from llm_gateway import LLMGateway, CircuitBreaker, TokenBucket, LLMUnavailable
+
+
+def make_gateway(failure_rate=0.0, burst=100, max_queue_seconds=5.0, max_retries=2):
+    model = FakeModel(first_token_latency=0.0, chunk_latency=0.0, failure_rate=failure_rate)
+    return LLMGateway(
+        model, model_name="fake", requests_per_minute=60000, burst=burst,
+        max_queue_seconds=max_queue_seconds, max_retries=max_retries, retry_base_seconds=0.0,
+        breaker=CircuitBreaker(failure_threshold=1, reset_seconds=0.0),
+    )
+
+
+def open_breaker(gateway):
+    gateway.model.failure_rate = 1.0
+    with pytest.raises(LLMUnavailable):
+        gateway.generate("prompt")
+    gateway.model.failure_rate = 0.0
+    assert gateway.breaker.state == "open"
+
+
+def test_half_open_trial_refused_by_quota_does_not_wedge_breaker():
+    gateway = make_gateway(max_queue_seconds=0.0)
+    open_breaker(gateway)
+
+    gateway.bucket = TokenBucket(rate=0.001, capacity=0)
+    with pytest.raises(LLMUnavailable, match="quota"):
+        gateway.generate("prompt")
+
+    gateway.bucket = TokenBucket(rate=1000.0, capacity=10)
+    assert gateway.generate("prompt") == gateway.model.text
+    assert gateway.breaker.state == "closed"
+
+
+def test_half_open_stream_closed_early_does_not_wedge_breaker():
+    gateway = make_gateway()
+    open_breaker(gateway)
+
+    async def run():
+        stream = gateway.stream("prompt")
+        first = await stream.__anext__()
+        await stream.aclose()  # client disconnected after the first chunk
+        return first
+
+    assert asyncio.run(run())
+    assert gateway.breaker.state == "half_open"
+    assert gateway.generate("prompt") == gateway.model.text
+    assert gateway.breaker.state == "closed"
+
+
+def test_half_open_stream_cancelled_does_not_wedge_breaker():
+    gateway = make_gateway()
+    gateway.model.first_token_latency = 1.0
+    open_breaker(gateway)
+
+    async def run():
+        async def consume():
+            async for _ in gateway.stream("prompt"):
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    gateway.model.first_token_latency = 0.0
+    assert gateway.generate("prompt") == gateway.model.text
+    assert gateway.breaker.state == "closed"
+
+
+def test_retries_take_quota_tokens():
+    gateway = make_gateway(max_queue_seconds=0.0, max_retries=5)
+    gateway.breaker = CircuitBreaker(failure_threshold=100)
+    gateway.bucket = TokenBucket(rate=0.001, capacity=2)
+    gateway.model.failure_rate = 1.0
+
+    with pytest.raises(LLMUnavailable):
+        gateway.generate("prompt")
+
+    # First attempt and one retry had tokens; the second retry had none
+    assert gateway.model.calls == 2
+    counters = gateway.stats()["calls"]["default"]
+    assert counters["retries"] == 1
+    assert counters["rate_limited"] == 1
+
+
+def test_quota_wait_does_not_hold_a_concurrency_slot():
+    gateway = make_gateway()
+    gateway.bucket = TokenBucket(rate=5.0, capacity=0)  # first token in 0.2s
+
+    caller = threading.Thread(target=gateway.generate, args=("prompt",))
+    caller.start()
+    time.sleep(0.1)
+    free = llm_slots._free
+    caller.join()
+
+    assert free == llm_slots.limit
+    assert gateway.model.calls == 1
+
+
+def test_missing_api_key_is_a_configuration_error(monkeypatch):
+    import llm_gateway
+
+    monkeypatch.setenv("LLM_BACKEND", "gemini")
+    monkeypatch.setattr(llm_gateway, "GEMINI_API_KEY", None)
+    with pytest.raises(llm_gateway.LLMConfigurationError, match="GEMINI_API_KEY"):
+        llm_gateway._default_model()
+
+
+def test_stream_releases_slot_before_a_slow_client_finishes_reading():
+    gateway = make_gateway()
+    gateway.model.chunk_latency = 0.01
+
+    async def run():
+        stream = gateway.stream("prompt")
+        parts = [await stream.__anext__()]
+        await asyncio.sleep(0.2)  # the client is slow; upstream is done by now
+        free = llm_slots._free
+        parts += [text async for text in stream]
+        return free, "".join(parts)
+
+    free, text = asyncio.run(run())
+    assert free == llm_slots.limit
+    assert text == gateway.model.text
+
+
+def test_stream_closed_early_releases_slot():
+    gateway = make_gateway()
+    gateway.model.chunk_latency = 0.5
+
+    async def run():
+        stream = gateway.stream("prompt")
+        await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0)  # let the cancelled reader leave llm_slots
+        return llm_slots._free
+
+    assert asyncio.run(run()) == llm_slots.limit
@@ -0,0 +1,58 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+CONTRACT = {"monthly_payment": "₹20,000", "interest_rate": "9.5%", "vehicle_make": "Honda", "vehicle_model": "City"}
+
+
+@pytest.fixture
+def client(fake_model):
+    return TestClient(main.app)
+
+
+def dealer(client, conversation_id, message, **body):
+    return client.post("/dealer/message", json={"conversation_id": conversation_id, "user_message": message, **body})
+
+
+def test_missing_session_context_is_409_not_default_terms(client):
+    conversation_id = str(uuid.uuid4())
+    response = dealer(client, conversation_id, "Can you lower it?")
+    assert response.status_code == 409
+    assert response.json()["detail"] == main.SESSION_CONTEXT_MISSING
+
+    response = client.post("/dealer/message/stream", json={"conversation_id": conversation_id, "user_message": "hi"})
+    assert response.status_code == 409
+
+    # Resending the full context recovers
+    response = dealer(client, conversation_id, "Can you lower it?", contract_context=CONTRACT)
+    assert response.status_code == 200
+    assert "₹20000" in response.json()["dealer_response"]
+
+    # and later turns can omit it again
+    assert dealer(client, conversation_id, "What is the interest rate?").json()["negotiation_round"] == 2
+
+
+def test_failed_llm_turn_does_not_use_up_a_round(client, fake_model):
+    conversation_id = str(uuid.uuid4())
+    assert dealer(client, conversation_id, "Can you lower it?", contract_context=CONTRACT).json()["negotiation_round"] == 1
+
+    fake_model.failure_rate = 1.0
+    failed = dealer(client, conversation_id, "What colours are there?").json()
+    assert failed["dealer_response"] == main.DEALER_FALLBACK
+
+    assert main.negotiation_sessions.get(conversation_id)["negotiation_context"]["negotiationRound"] == 1
+
+
+def test_guidance_prompt_uses_session_context(client):
+    conversation_id = str(uuid.uuid4())
+    dealer(client, conversation_id, "Can you lower it?", contract_context=CONTRACT)
+
+    request = main.NegotiationGuidanceRequest(
+        user_message="Can you lower it?", dealer_response="Maybe.", conversation_id=conversation_id
+    )
+    prompt = main._guidance_prompt(request)
+    assert "Honda City" in prompt
+    assert "Negotiation Round: 1" in prompt
@@ -0,0 +1,74 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import OCR
+
+NATIVE_TEXT = "This page has a real embedded text layer with plenty of words on it."
+
+
+@pytest.fixture
+def fake_pdf(monkeypatch):
+    """A 7-page PDF: pages 2 and 5 have a text layer, the rest are scans"""
+    monkeypatch.setattr(OCR, "pdfinfo_from_path", lambda path: {"Pages": 7})
+    monkeypatch.setattr(OCR, "extract_text_layer",
+                        lambda path: [NATIVE_TEXT if n in (2, 5) else "" for n in range(1, 8)])
+    monkeypatch.setattr(OCR, "convert_from_path",
+                        lambda path, dpi, first_page, last_page: list(range(first_page, last_page + 1)))
+
+    def ocr_page(page):
+        time.sleep(0.002 * (8 - page))  # later pages finish first
+        return f"scanned page {page}", 0.0
+    monkeypatch.setattr(OCR, "_ocr_page", ocr_page)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_pages_are_reassembled_in_order(fake_pdf, monkeypatch, workers):
+    pool = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(OCR, "page_pool", lambda: pool)
+
+    text, timings = OCR.ocr_pdf_with_timings("contract.pdf", workers=workers, max_resident_pages=3)
+    pool.shutdown()
+
+    expected = [NATIVE_TEXT if n in (2, 5) else f"scanned page {n}" for n in range(1, 8)]
+    positions = [text.index(f"[Page {n}]\n{page}") for n, page in enumerate(expected, start=1)]
+    assert positions == sorted(positions)
+    assert [t["page"] for t in timings] == list(range(1, 8))
+    assert [t["source"] for t in timings] == ["ocr", "text_layer", "ocr", "ocr", "text_layer", "ocr", "ocr"]
+
+
+def test_documents_share_one_page_pool(monkeypatch):
+    monkeypatch.setattr(OCR, "OCR_WORKERS", 2)
+    monkeypatch.setattr(OCR, "_page_pool", None)
+    try:
+        assert OCR.page_pool() is OCR.page_pool()
+    finally:
+        OCR.shutdown_page_pool()
+    assert OCR._page_pool is None
+
+
+def test_page_windows_hold_at_most_window_pages(monkeypatch):
+    live = set()
+    peak = []
+
+    class Image:
+        def __init__(self, number):
+            self.number = number
+            live.add(number)
+            peak.append(len(live))
+
+        def __del__(self):
+            live.discard(self.number)
+
+    monkeypatch.setattr(OCR, "convert_from_path",
+                        lambda path, dpi, first_page, last_page: [Image(n) for n in range(first_page, last_page + 1)])
+
+    seen = []
+    for numbers, pages in OCR.iter_page_windows("contract.pdf", [1, 2, 3, 4, 5, 6, 7, 9, 10], window=3):
+        assert len(pages) <= 3
+        seen.extend(numbers)
+        del pages
+
+    assert seen == [1, 2, 3, 4, 5, 6, 7, 9, 10]
+    assert max(peak) <= 3
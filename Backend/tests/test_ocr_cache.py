@@ -0,0 +1,75 @@
+import os
+import json
+
+import OCR
+from ocr_cache import OCRCache
+
+PDF = b"%PDF-1.4 contract"
+
+
+def entry(text):
+    return {"ocr_text": text, "page_timings": []}
+
+
+def entry_size(text):
+    return len(json.dumps(entry(text), ensure_ascii=False).encode("utf-8"))
+
+
+def test_key_depends_on_bytes_and_every_ocr_setting(monkeypatch):
+    settings = OCR.ocr_settings()
+    key = OCRCache.make_key(PDF, settings)
+
+    assert OCRCache.make_key(PDF, dict(reversed(list(settings.items())))) == key
+    assert OCRCache.make_key(PDF + b" ", settings) != key
+    for name, value in settings.items():
+        changed = dict(settings, **{name: not value if isinstance(value, bool) else value * 2})
+        assert OCRCache.make_key(PDF, changed) != key, name
+
+    monkeypatch.setattr(OCR, "OCR_DPI", OCR.OCR_DPI + 100)
+    assert OCRCache.make_key(PDF, OCR.ocr_settings()) != key
+
+
+def test_hit_and_miss_counters(tmp_path):
+    cache = OCRCache(directory=str(tmp_path))
+    assert cache.get("a") is None
+    cache.put("a", entry("first"))
+    assert cache.get("a") == entry("first")
+    assert cache.get("a") == entry("first")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, 0.667)
+    assert stats["entries"] == 1 and stats["bytes"] == entry_size("first")
+
+
+def test_unreadable_entry_is_a_miss_and_dropped(tmp_path):
+    cache = OCRCache(directory=str(tmp_path))
+    cache.put("a", entry("first"))
+    with open(cache._path("a"), "w") as f:
+        f.write("{not json")
+
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1 and cache.stats()["entries"] == 0
+
+
+def test_evicts_least_recently_used_from_disk(tmp_path):
+    cache = OCRCache(directory=str(tmp_path), max_bytes=2 * entry_size("a"))
+    cache.put("a", entry("a"))
+    cache.put("b", entry("b"))
+    cache.get("a")  # b is now the least recently used
+    cache.put("c", entry("c"))
+
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_reopened_cache_keeps_lru_order_from_mtimes(tmp_path):
+    cache = OCRCache(directory=str(tmp_path))
+    for key, mtime in (("a", 300), ("b", 100), ("c", 200)):
+        cache.put(key, entry(key))
+        os.utime(cache._path(key), (mtime, mtime))
+
+    reopened = OCRCache(directory=str(tmp_path), max_bytes=2 * entry_size("a"))
+    assert list(reopened._index) == ["b", "c", "a"]
+    reopened.put("d", entry("d"))
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "d.json"]
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from pipeline import run_stage_graph
+
+
+def stage(log, name, seconds=0.0, result=None):
+    async def run(*deps):
+        log.append(("start", name, deps))
+        await asyncio.sleep(seconds)
+        log.append(("end", name))
+        return name if result is None else result
+    return run
+
+
+def test_stage_runs_after_its_dependencies_with_their_results():
+    log = []
+    stages = {
+        "score": (stage(log, "score"), ["sla", "price"]),
+        "sla": (stage(log, "sla", 0.02), ["ocr"]),
+        "price": (stage(log, "price", 0.01), ["ocr"]),
+        "ocr": (stage(log, "ocr", 0.01, result="text"), []),
+    }
+    results, _ = asyncio.run(run_stage_graph(stages))
+
+    assert results == {"ocr": "text", "sla": "sla", "price": "price", "score": "score"}
+    assert ("start", "sla", ("text",)) in log
+    assert ("start", "score", ("sla", "price")) in log
+    assert log.index(("end", "ocr")) < log.index(("start", "sla", ("text",)))
+    assert log.index(("end", "sla")) < log.index(("start", "score", ("sla", "price")))
+
+
+def test_independent_stages_run_in_parallel():
+    log = []
+    stages = {name: (stage(log, name, 0.2), []) for name in ("sla", "price", "vin")}
+    _, timings = asyncio.run(run_stage_graph(stages))
+
+    assert [event[0] for event in log[:3]] == ["start"] * 3
+    assert timings["total_seconds"] < 0.4
+
+
+def test_timings_record_start_offset_and_seconds():
+    log = []
+    stages = {
+        "ocr": (stage(log, "ocr", 0.1), []),
+        "sla": (stage(log, "sla", 0.05), ["ocr"]),
+    }
+    _, timings = asyncio.run(run_stage_graph(stages))
+
+    assert timings["ocr"]["start"] < 0.05
+    assert timings["ocr"]["seconds"] >= 0.1
+    assert timings["sla"]["start"] >= timings["ocr"]["start"] + timings["ocr"]["seconds"] - 0.002
+    assert timings["sla"]["seconds"] >= 0.05
+    assert timings["total_seconds"] >= timings["sla"]["start"] + timings["sla"]["seconds"] - 0.002
+
+
+@pytest.mark.parametrize("stages, message", [
+    ({"a": (None, ["b"]), "b": (None, ["a"])}, "Cycle"),
+    ({"a": (None, ["missing"])}, "Unknown stage"),
+])
+def test_invalid_graph_is_rejected(stages, message):
+    with pytest.raises(ValueError, match=message):
+        asyncio.run(run_stage_graph(stages))
+
+
+def test_failed_stage_cancels_the_rest():
+    log = []
+
+    async def fail():
+        raise RuntimeError("OCR failed")
+
+    stages = {
+        "ocr": (fail, []),
+        "price": (stage(log, "price", 0.5), []),
+        "sla": (stage(log, "sla"), ["ocr"]),
+    }
+
+    async def run():
+        with pytest.raises(RuntimeError, match="OCR failed"):
+            await run_stage_graph(stages)
+        await asyncio.sleep(0.6)
+
+    asyncio.run(run())
+    assert ("end", "price") not in log
+    assert not any(event[1] == "sla" for event in log)
@@ -0,0 +1,102 @@
+import time
+import asyncio
+
+import pytest
+
+from price_cache import PriceQuoteCache
+
+KEY = PriceQuoteCache.make_key("Maruti", "Swift", 2017)
+
+
+class Provider:
+    """Counts fetches; each one takes `seconds`"""
+
+    def __init__(self, seconds=0.0):
+        self.seconds = seconds
+        self.fetches = 0
+
+    async def fetch(self):
+        self.fetches += 1
+        await asyncio.sleep(self.seconds)
+        return f"quote {self.fetches}"
+
+
+def test_key_ignores_case_and_whitespace():
+    assert PriceQuoteCache.make_key(" maruti ", "SWIFT", "2017") == KEY
+
+
+def test_concurrent_callers_share_one_fetch():
+    cache = PriceQuoteCache()
+    provider = Provider(seconds=0.05)
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_compute(KEY, provider.fetch) for _ in range(10)))
+
+    assert asyncio.run(run()) == ["quote 1"] * 10
+    assert provider.fetches == 1
+    assert cache.stats() == {"entries": 1, "in_flight": 0, "hits": 0, "misses": 1, "coalesced": 9}
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_fetch():
+    cache = PriceQuoteCache()
+    provider = Provider(seconds=0.1)
+
+    async def run():
+        first = asyncio.ensure_future(cache.get_or_compute(KEY, provider.fetch))
+        second = asyncio.ensure_future(cache.get_or_compute(KEY, provider.fetch))
+        await asyncio.sleep(0.02)
+        first.cancel()  # e.g. that client disconnected
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "quote 1"
+    assert provider.fetches == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = PriceQuoteCache(ttl_seconds=0.1)
+    provider = Provider()
+
+    async def run():
+        first = await cache.get_or_compute(KEY, provider.fetch)
+        cached = await cache.get_or_compute(KEY, provider.fetch)
+        time.sleep(0.15)
+        expired = await cache.get_or_compute(KEY, provider.fetch)
+        return first, cached, expired
+
+    assert asyncio.run(run()) == ("quote 1", "quote 1", "quote 2")
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_uncacheable_and_failed_results_are_not_stored():
+    cache = PriceQuoteCache()
+    provider = Provider()
+
+    async def fail():
+        raise ConnectionError("provider down")
+
+    async def run():
+        await cache.get_or_compute(KEY, provider.fetch, cacheable=lambda value: False)
+        with pytest.raises(ConnectionError):
+            await cache.get_or_compute(KEY, fail)
+        return await cache.get_or_compute(KEY, provider.fetch)
+
+    assert asyncio.run(run()) == "quote 2"
+    assert provider.fetches == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PriceQuoteCache(max_entries=2)
+    provider = Provider()
+    keys = [PriceQuoteCache.make_key("Maruti", model, 2017) for model in ("Swift", "Alto", "Dzire")]
+
+    async def run():
+        for key in keys[:2]:
+            await cache.get_or_compute(key, provider.fetch)
+        await cache.get_or_compute(keys[0], provider.fetch)  # Alto is now oldest
+        await cache.get_or_compute(keys[2], provider.fetch)
+
+    asyncio.run(run())
+    assert list(cache._entries) == [keys[0], keys[2]]
@@ -0,0 +1,79 @@
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from price_engine import annuity_factor, calculate_emi, calculate_price, emi_grid
+
+DOWN_PAYMENTS = [0.0, 0.1, 0.2, 0.35, 0.5]
+TERMS = [1, 12, 36, 60, 84]
+APRS = [0.0, 0.5, 6.0, 8.5, 13.25, 24.0]
+
+
+@pytest.mark.parametrize("price", [1, 99999, 250000, 735421, 2000000])
+def test_grid_matches_scalar_emi_cell_by_cell(price):
+    grid = emi_grid(price, DOWN_PAYMENTS, TERMS, APRS)
+    assert grid.shape == (len(DOWN_PAYMENTS), len(TERMS), len(APRS))
+
+    for (i, down), (j, months), (k, apr) in itertools.product(
+            enumerate(DOWN_PAYMENTS), enumerate(TERMS), enumerate(APRS)):
+        assert grid[i, j, k] == calculate_emi(price, down, months, apr), (down, months, apr)
+
+
+def test_grid_of_non_positive_price_is_zero():
+    assert not emi_grid(0, DOWN_PAYMENTS, TERMS, APRS).any()
+    assert not emi_grid(-5, DOWN_PAYMENTS, TERMS, APRS).any()
+
+
+def test_zero_rate_annuity_factor_is_straight_line():
+    annuity_factor.cache_clear()
+    assert annuity_factor(0.0, 36) == 1 / 36
+    assert annuity_factor(0.0, 36) == 1 / 36  # served from the cache
+    assert annuity_factor.cache_info().hits == 1
+    assert calculate_emi(360000, down_payment=0.0, months=36, apr=0.0) == 10000
+
+
+def test_annuity_factor_cache_is_keyed_by_rate_and_term():
+    annuity_factor.cache_clear()
+    assert annuity_factor(8.5, 36) != annuity_factor(8.5, 48)
+    assert annuity_factor(8.5, 36) != annuity_factor(9.0, 36)
+    assert annuity_factor.cache_info().misses == 3
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def test_emi_grid_endpoint(client):
+    body = {"price": 500000, "down_payments": [0.1, 0.2], "terms": [12, 36], "aprs": [0.0, 8.5, 12.0]}
+    response = client.post("/api/emi-grid", json=body)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["price"] == 500000
+    assert data["emi"] == [
+        [[calculate_emi(500000, down, months, apr) for apr in body["aprs"]] for months in body["terms"]]
+        for down in body["down_payments"]
+    ]
+
+
+def test_emi_grid_endpoint_estimates_price_from_vehicle(client):
+    data = client.post("/api/emi-grid", json={"make": "Honda", "year": 2022}).json()
+    assert data["price"] == calculate_price("Honda", 2022)["vehicle_price"]
+    assert len(data["emi"]) == len(data["down_payments"])
+    assert len(data["emi"][0]) == len(data["terms"])
+    assert len(data["emi"][0][0]) == len(data["aprs"])
+
+
+@pytest.mark.parametrize("body", [
+    {"price": 500000, "terms": []},
+    {"price": 500000, "down_payments": [1.0]},
+    {"price": 500000, "terms": [0]},
+    {"price": 500000, "aprs": [-1.0]},
+    {"make": "Honda"},
+    {"price": 500000, "down_payments": [0.1] * 100, "terms": [12] * 100, "aprs": [8.5] * 10},
+])
+def test_emi_grid_endpoint_rejects_bad_input(client, body):
+    assert client.post("/api/emi-grid", json=body).status_code == 400
@@ -0,0 +1,19 @@
+import pytest
+
+from price_engine import quote_emis
+from price_providers import PriceProvider, DEFAULT_PROVIDERS, query_providers
+
+
+def test_price_provider_is_abstract():
+    with pytest.raises(TypeError):
+        PriceProvider("incomplete")
+
+
+def test_dealer_network_is_market_row_plus_margin():
+    market, dealer = DEFAULT_PROVIDERS
+    row = market.quote("Maruti", "Swift", 2017)
+    assert row == {"vehicle_price": 205500, "min_price": 189000, "max_price": 222000}
+
+    sources, unavailable = query_providers("Maruti", "Swift", 2017)
+    assert unavailable == []
+    assert sources == [quote_emis("Indian Market Data", row), quote_emis("Dealer Network", row, 1.05)]
@@ -0,0 +1,131 @@
+import os
+import re
+import json
+import random
+import shutil
+
+from rule_engine import FAIRNESS_RULES_FILE, RuleEngine
+from score_batch import random_record
+
+
+def legacy_fairness_score(sla_data):
+    """The if/elif ladder Score.calculate_fairness_score used before rule_engine"""
+    def extract_number(text):
+        if not text or "Not specified" in text:
+            return None
+        match = re.search(r"\d+(\.\d+)?", text)
+        return float(match.group()) if match else None
+
+    score = 0
+    reasons = []
+
+    apr = extract_number(sla_data.get("interest_rate_apr", {}).get("value"))
+    if apr is None:
+        score += 10
+        reasons.append("Interest rate not specified")
+    elif apr <= 7:
+        score += 30
+        reasons.append("Low interest rate")
+    elif apr <= 10:
+        score += 25
+        reasons.append("Moderate interest rate")
+    elif apr <= 14:
+        score += 15
+        reasons.append("High interest rate")
+    else:
+        score += 5
+        reasons.append("Very high interest rate")
+
+    penalty = sla_data.get("late_fee_penalty", {}).get("value")
+    if not penalty or "Not specified" in penalty:
+        score += 8
+        reasons.append("Penalty terms not specified")
+    elif "______" in penalty:
+        score += 12
+        reasons.append("Penalty unclear")
+    else:
+        score += 20
+        reasons.append("Penalty clearly defined")
+
+    termination = sla_data.get("termination_clause", {}).get("value")
+    if not termination or "Not specified" in termination:
+        score += 8
+        reasons.append("Termination terms not specified")
+    elif "allowed" in termination.lower():
+        score += 20
+        reasons.append("Early termination allowed")
+    else:
+        score += 12
+        reasons.append("Restricted termination")
+
+    unclear = sum(
+        1 for v in sla_data.values()
+        if v.get("value") in [None, "Not specified"] or "______" in str(v.get("value"))
+    )
+    if unclear == 0:
+        score += 15
+        reasons.append("High transparency")
+    elif unclear <= 2:
+        score += 8
+        reasons.append("Moderate transparency")
+    else:
+        score += 4
+        reasons.append("Low transparency")
+
+    dp = extract_number(sla_data.get("down_payment", {}).get("value"))
+    if dp is None:
+        score += 8
+        reasons.append("Down payment not specified")
+    elif dp <= 20:
+        score += 15
+        reasons.append("Low down payment")
+    elif dp <= 40:
+        score += 10
+        reasons.append("Moderate down payment")
+    else:
+        score += 5
+        reasons.append("High down payment")
+
+    score = min(score, 100)
+    level = (
+        "Fair" if score >= 80 else
+        "Acceptable" if score >= 60 else
+        "Risky" if score >= 40 else
+        "Unfair"
+    )
+    return {"fairness_score": score, "fairness_level": level, "reasons": reasons}
+
+
+def test_rules_file_matches_legacy_ladder():
+    engine = RuleEngine(FAIRNESS_RULES_FILE)
+    rng = random.Random(3)
+    records = [random_record(rng) for _ in range(2000)]
+    records.append({})
+    records.append({"interest_rate_apr": {"value": "7%"}, "down_payment": {"value": "20"},
+                    "termination_clause": {"value": "Early termination ALLOWED"}})
+    for record in records:
+        assert engine.score(record) == legacy_fairness_score(record)
+
+
+def test_changed_rules_file_is_hot_reloaded(tmp_path):
+    path = tmp_path / "fairness_rules.json"
+    shutil.copy(FAIRNESS_RULES_FILE, path)
+    engine = RuleEngine(str(path), reload_interval=0.0)
+    record = {"interest_rate_apr": {"value": "6%"}}
+    before = engine.score(record)
+
+    config = json.loads(path.read_text(encoding="utf-8"))
+    interest = next(rule for rule in config["rules"] if rule["name"] == "interest_rate")
+    interest["brackets"][0]["points"] -= 10
+    path.write_text(json.dumps(config), encoding="utf-8")
+    mtime = os.path.getmtime(path) + 10
+    os.utime(path, (mtime, mtime))
+
+    assert engine.score(record)["fairness_score"] == before["fairness_score"] - 10
+    assert engine.stats()["version"] == 2
+
+    # A broken file is reported and the last good rules stay active
+    path.write_text("{", encoding="utf-8")
+    os.utime(path, (mtime + 10, mtime + 10))
+    assert engine.score(record)["fairness_score"] == before["fairness_score"] - 10
+    assert engine.stats()["last_error"]
@@ -0,0 +1,77 @@
+import pytest
+
+from fake_llm import FakeModel
+from rule_extractor import SLA_RULE_MIN_CONFIDENCE, benchmark, extract_sla_rules, load_corpus, unresolved_fields
+
+
+def _value(text, field):
+    return extract_sla_rules(text)[field]["value"]
+
+
+@pytest.mark.parametrize("text, field, value", [
+    ("The Annual Percentage Rate (APR) is 10.5% per annum.", "interest_rate_apr", "10.5% per annum"),
+    ("Rate of interest: 9.25% p.a. fixed", "interest_rate_apr", "9.25% per annum"),
+    ("Monthly EMI: Rs. 12,450 payable on the 5th", "emi_amount", 12450.0),
+    ("Monthly instalment of ₹8,999.50", "emi_amount", 8999.5),
+    ("Down payment: 20%", "down_payment", "20%"),
+    ("Down payment (Rs. 50,000) paid at signing", "down_payment", "₹50000"),
+    ("Down payment of ₹ 1,50,000", "down_payment", "₹150000"),
+    ("Margin money of 25 % of the ex-showroom price", "down_payment", "25%"),
+    ("Processing fee: ₹ 5,000 (non-refundable)", "processing_fees", "Processing fee: ₹ 5,000 (non-refundable)"),
+    ("Late payment charges of Rs. 500 per month of delay", "late_fee_penalty", "Late payment charges of Rs. 500 per month of delay"),
+    ("Foreclosure is allowed after 12 EMIs with a 4% charge.", "termination_clause", "Foreclosure is allowed after 12 EMIs with a 4% charge."),
+    ("Comprehensive insurance is mandatory for the loan tenure.", "insurance_mandatory", True),
+    ("The Borrower shall maintain comprehensive insurance on the vehicle.", "insurance_mandatory", True),
+])
+def test_rules_extract_standard_phrasing(text, field, value):
+    assert _value(text, field) == value
+
+
+@pytest.mark.parametrize("text, field", [
+    ("Monthly payment is due on the 5th of every month.", "emi_amount"),
+    ("No insurance required.", "insurance_mandatory"),
+    ("For cash purchases no comprehensive insurance is required.", "insurance_mandatory"),
+    ("This agreement is governed by the laws of India.", "interest_rate_apr"),
+])
+def test_decoys_do_not_match(text, field):
+    assert _value(text, field) is None
+
+
+def test_negation_only_skips_the_negated_clause():
+    text = "No insurance required for the accessories. Insurance is mandatory for the vehicle."
+    assert _value(text, "insurance_mandatory") is True
+
+
+def test_bare_emi_amount_is_left_for_the_llm():
+    result = extract_sla_rules("Monthly instalment of 12,450 payable in advance")
+    assert result["emi_amount"]["value"] == 12450.0
+    assert result["emi_amount"]["confidence"] < SLA_RULE_MIN_CONFIDENCE
+    assert "emi_amount" in unresolved_fields(result)
+
+
+@pytest.mark.parametrize("text, field", [
+    ("Down Payment (by Borrower) = (3,00,000)", "down_payment"),      # no unit
+    ("Overdue 1-6 days:\n1% penal interest per annum on", "late_fee_penalty"),  # cut-off table cell
+])
+def test_ambiguous_values_are_left_for_the_llm(text, field):
+    result = extract_sla_rules(text)
+    assert result[field]["value"] is not None
+    assert field in unresolved_fields(result)
+
+
+def test_benchmark_measures_both_paths_against_the_stub_model(tmp_path):
+    (tmp_path / "complete.txt").write_text(
+        "APR: 10.5% per annum\nLate payment charges of Rs. 500 per month\n"
+        "Early termination allowed with 2% charge\nDown payment: 20%\nMonthly EMI: Rs. 12,450\n"
+        "Insurance is mandatory\nProcessing fee: Rs. 5,000\n", encoding="utf-8")
+    (tmp_path / "cached.json").write_text('{"ocr_text": "Monthly EMI: Rs. 9,000"}', encoding="utf-8")
+
+    documents = load_corpus([str(tmp_path / "*.txt"), str(tmp_path / "*.json")])
+    model = FakeModel(first_token_latency=0.0, chunk_latency=0.0)
+    report = benchmark(documents, model)
+
+    assert report["documents"] == 2
+    assert report["fields_resolved_by_rules"] == "7/14"
+    # termination_clause never reaches the rule threshold, so both paths call the model per document
+    assert model.calls == 4
+    assert report["prompt_tokens_rules_first"] < report["prompt_tokens_llm_only"]
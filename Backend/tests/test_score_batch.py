@@ -0,0 +1,19 @@
+import random
+
+import pytest
+
+from Score import calculate_fairness_score
+from score_batch import calculate_fairness_scores, random_record, to_results
+
+
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_vectorized_scores_match_scalar_scorer(seed):
+    rng = random.Random(seed)
+    records = [random_record(rng) for _ in range(2000)]
+    assert to_results(calculate_fairness_scores(records)) == [calculate_fairness_score(r) for r in records]
+
+
+def test_empty_batch():
+    batch = calculate_fairness_scores([])
+    assert len(batch["scores"]) == 0
+    assert to_results(batch) == []
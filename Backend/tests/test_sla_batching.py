@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+import llm_engine
+from llm_cache import LLMCache
+from llm_gateway import llm_gateway
+
+FIELDS = ["termination_clause", "late_fee_penalty"]
+FULL = {field: {"value": "as per clause", "confidence": 0.9} for field in FIELDS}
+
+
+class ScriptedModel:
+    """Gives a fixed answer to the batch prompt and a full answer to single prompts"""
+
+    def __init__(self, batch_answer):
+        self.batch_answer = batch_answer
+        self.prompts = []
+
+    def generate_content(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+
+        class Response:
+            text = json.dumps(self.batch_answer if "=== contract_1 ===" in prompt else FULL)
+        return Response()
+
+
+@pytest.fixture
+def scripted(monkeypatch):
+    def install(batch_answer):
+        model = ScriptedModel(batch_answer)
+        monkeypatch.setattr(llm_gateway(), "model", model)
+        monkeypatch.setattr(llm_engine, "llm_cache", LLMCache(disk_dir=None))
+        return model
+    return install
+
+
+@pytest.mark.parametrize("bad_answer", [{}, {"termination_clause": {"value": "x", "confidence": 0.5}}, []])
+def test_incomplete_batched_answer_is_retried_alone_and_not_cached(scripted, bad_answer):
+    model = scripted({"contract_1": bad_answer, "contract_2": FULL})
+    docs = [("first contract text", FIELDS), ("second contract text", FIELDS)]
+
+    results = llm_engine._run_sla_batch(docs)
+
+    assert results[0] == (FULL, 1)      # retried with its own prompt
+    assert results[1] == (FULL, 2)      # accepted from the batch
+    assert len(model.prompts) == 2
+
+    for contract_text, fields in docs:
+        cached = llm_engine._cached_json(llm_engine._sla_prompt(contract_text, fields))
+        assert cached == FULL
+
+
+def test_unparseable_batch_retries_every_contract(scripted):
+    model = scripted(["not", "an", "object"])
+    results = llm_engine._run_sla_batch([("a", FIELDS), ("b", FIELDS)])
+    assert [r[0] for r in results] == [FULL, FULL]
+    assert len(model.prompts) == 3
+
+
+def test_non_object_answer_keeps_rule_results(scripted):
+    model = scripted(None)
+    model.generate_content = lambda prompt, **kwargs: type("Response", (), {"text": '["not", "an", "object"]'})()
+    text = "Loan agreement between the parties."
+
+    sla_data, report = llm_engine.extract_sla_fields_with_report(text)
+
+    assert report["llm_fields"]
+    assert report["llm_error"] == "Invalid JSON from Gemini"
+    rules = llm_engine.extract_sla_rules(text)
+    assert all(sla_data[field] == rules[field] for field in report["llm_fields"])
+
+
+def test_extraction_counts_one_cache_lookup(scripted):
+    scripted(None)
+    text = "Loan agreement between the parties."
+
+    llm_engine.extract_sla_fields_with_report(text)
+    assert llm_engine.llm_cache.stats()["misses"] == 1
+
+    llm_engine.extract_sla_fields_with_report(text)
+    stats = llm_engine.llm_cache.stats()
+    assert (stats["misses"], stats["memory_hits"]) == (1, 1)
@@ -0,0 +1,88 @@
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+CHAT_BODY = {"user_message": "How do I lower my EMI?", "contract_context": json.dumps({"fairness_score": 62})}
+GUIDANCE_BODY = {"user_message": "Can you lower it?", "dealer_response": "Maybe."}
+
+
+@pytest.fixture
+def client(fake_model):
+    return TestClient(main.app)
+
+
+def events(response):
+    """[(event, data)] from an SSE body"""
+    parsed = []
+    for block in response.text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        parsed.append((fields["event"], json.loads(fields["data"])))
+    return parsed
+
+
+@pytest.mark.parametrize("path, body", [("/chat/stream", CHAT_BODY), ("/negotiation/guidance/stream", GUIDANCE_BODY)])
+def test_tokens_then_done_with_timings(client, fake_model, path, body):
+    response = client.post(path, json=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    stream = events(response)
+    names = [name for name, _ in stream]
+    assert names[-1] == "done" and names.count("done") == 1
+    assert names[:-1] == ["token"] * len(fake_model.chunks)
+    assert "".join(data["text"] for _, data in stream[:-1]) == fake_model.text
+
+    done = stream[-1][1]
+    assert "error" not in done
+    assert isinstance(done["ttft_seconds"], float) and isinstance(done["total_seconds"], float)
+    assert 0 <= done["ttft_seconds"] <= done["total_seconds"]
+
+
+def test_time_to_first_token_reflects_model_latency(client, fake_model):
+    fake_model.first_token_latency = 0.2
+    fake_model.chunk_latency = 0.02
+    done = events(client.post("/chat/stream", json=CHAT_BODY))[-1][1]
+    assert done["ttft_seconds"] >= 0.2
+    assert done["total_seconds"] >= done["ttft_seconds"] + 0.02 * (len(fake_model.chunks) - 1)
+
+
+@pytest.mark.parametrize("path, body, fallback", [
+    ("/chat/stream", CHAT_BODY, main.CHAT_FALLBACK),
+    ("/negotiation/guidance/stream", GUIDANCE_BODY, main.GUIDANCE_FALLBACK),
+])
+def test_fallback_when_model_fails_before_first_token(client, fake_model, path, body, fallback):
+    fake_model.failure_rate = 1.0
+    stream = events(client.post(path, json=body))
+
+    assert [name for name, _ in stream] == ["token", "done"]
+    assert stream[0][1]["text"] == fallback
+    done = stream[1][1]
+    assert done["error"]
+    assert done["ttft_seconds"] is None
+    assert isinstance(done["total_seconds"], float)
+
+
+def test_rule_based_dealer_reply_is_one_token(client, fake_model):
+    body = {"conversation_id": str(uuid.uuid4()), "user_message": "Can you lower it?",
+            "contract_context": {"monthly_payment": "20000"}}
+    stream = events(client.post("/dealer/message/stream", json=body))
+
+    assert [name for name, _ in stream] == ["token", "done"]
+    assert "₹19000" in stream[0][1]["text"]
+    assert stream[1][1]["source"] == "rules"
+    assert stream[1][1]["negotiation_round"] == 1
+
+
+def test_llm_dealer_reply_streams_and_advances_round(client, fake_model):
+    conversation_id = str(uuid.uuid4())
+    body = {"conversation_id": conversation_id, "user_message": "What colours are there?",
+            "contract_context": {"monthly_payment": "20000"}}
+    stream = events(client.post("/dealer/message/stream", json=body))
+
+    assert [name for name, _ in stream][-1] == "done"
+    assert stream[-1][1]["source"] == "llm"
+    assert main.negotiation_sessions.get(conversation_id)["negotiation_context"]["negotiationRound"] == 1
@@ -0,0 +1,101 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import vehicle_details
+from mock_vpic import start_mock_vpic, sample_vins
+from vin_decoder import is_well_formed_vin, with_check_digit
+from vin_service import VinService
+from vehicle_details import extract_vin, get_vehicle_details
+
+
+@pytest.fixture
+def service(tmp_path):
+    server, base_url = start_mock_vpic()
+    yield VinService(base_url=base_url, cache_path=str(tmp_path / "vins.sqlite3"))
+    server.shutdown()
+
+
+@pytest.fixture
+def broken_service(tmp_path, monkeypatch):
+    server, base_url = start_mock_vpic(broken=True)
+    service = VinService(base_url=base_url, cache_path=str(tmp_path / "vins.sqlite3"))
+    monkeypatch.setattr(vehicle_details, "default_service", lambda: service)
+    yield service
+    server.shutdown()
+
+
+def test_empty_decodes_are_not_cached(service):
+    known = sample_vins(1)[0]
+    unknown = with_check_digit("ZZZEC4A400U000001")  # WMI and year code the mock does not know
+
+    assert service.decode(unknown) == {}
+    assert service.decode_many([known, unknown])[unknown] == {}
+    assert service.decode(known)["Make"]
+
+    assert service.stats()["cached_vins"] == 1
+    service.decode(unknown)
+    assert service.stats()["remote_calls"] == 3
+
+
+@pytest.mark.parametrize("vin, ok", [
+    ("1HGEC4A40AU000001", True),
+    ("1hgec4a40au000001", True),
+    ("1HGEC4A40AU00000", False),    # 16 characters
+    ("1HGEC4A40AU0000011", False),  # 18 characters
+    ("1HGEC4A40OU000001", False),   # O is never used in a VIN
+    ("1HGEC4A40AU00000-", False),
+    ("", False),
+])
+def test_well_formed_vin(vin, ok):
+    assert is_well_formed_vin(vin) is ok
+
+
+def test_decode_batch_rejects_malformed_vins():
+    client = TestClient(main.app)
+    response = client.post("/vehicle/decode-batch", json={"vins": ["1HGEC4A40AU000001", "1HGEC4A40IU000001", "short"]})
+    assert response.status_code == 400
+    assert "1HGEC4A40IU000001" in response.json()["detail"]
+    assert "short" in response.json()["detail"]
+    assert "1HGEC4A40AU000001" not in response.json()["detail"]
+
+
+@pytest.mark.parametrize("text, vin", [
+    ("These characterizations are binding on both parties.", None),
+    ("The Borrower acknowledges all INTERRELATIONSHIPS and obligations.", None),
+    ("Engine No: 1HGEC4A40AU000003", None),  # unlabeled, wrong check digit
+    ("These characterizations are binding. VIN: MA3EWDE1S00I23456", "MA3EWDE1S00123456"),
+    ("Reference 1HGEC4A40AU000002 on file", "1HGEC4A40AU000002"),  # unlabeled, valid check digit
+])
+def test_extract_vin_ignores_prose_decoys(text, vin):
+    assert extract_vin(text) == vin
+
+
+def test_invalid_vins_are_not_decoded():
+    # well-formed but unlabeled with a wrong check digit: no made-up Model Year
+    assert get_vehicle_details("CHARACTER1ZAT10NS") is None
+    assert get_vehicle_details("1HGEC4A40OU000001", labeled=True) is None  # O is never used in a VIN
+    # a labeled VIN is decoded offline even if its check digit fails
+    assert get_vehicle_details("MA3EWDE1S00123456", labeled=True)["Make"] == "MARUTI SUZUKI"
+
+
+def test_non_json_vpic_reply_is_a_failed_lookup_and_not_cached(broken_service):
+    vin, other = sample_vins(2)
+
+    assert broken_service.decode(vin) is None
+    assert broken_service.decode_many([vin, other]) == {vin: None, other: None}
+    assert broken_service.decode(vin) is None
+
+    stats = broken_service.stats()
+    assert stats["cached_vins"] == 0
+    assert stats["remote_calls"] == 3
+
+
+def test_non_json_vpic_reply_falls_back_to_offline_details(broken_service):
+    vin = sample_vins(1)[0]
+    details = get_vehicle_details(vin)
+    assert details["Make"] and "Model" not in details
+
+    response = TestClient(main.app).post("/vehicle/decode-batch", json={"vins": [vin]})
+    assert response.status_code == 200
+    assert response.json()["vehicles"][vin] == details
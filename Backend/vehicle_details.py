@@ -1,59 +1,145 @@
 
 import re
-import requests
 import json
+import requests
+
+from vin_service import default_service, REQUIRED_FIELDS
+from vin_decoder import decode_offline, is_valid_vin, is_well_formed_vin, wmi_table
 
 # =========================
 # VIN EXTRACTION
 # =========================
 
-VIN_REGEX = r"\b[A-HJ-NPR-Z0-9]{17}\b"
+# 17-character alphanumeric runs, case-insensitive so the text is never
+# upper-cased as a whole; I/O/Q are allowed here and repaired below.
+_VIN_CANDIDATE = re.compile(r"(?<![A-Za-z0-9])[A-Za-z0-9]{17}(?![A-Za-z0-9])")
+_VIN_LABEL = re.compile(r"\b(?:VIN|V\.I\.N|VEHICLE\s+IDENTIFICATION|CHASSIS)", re.IGNORECASE)
 
-def extract_vin(contract_text: str):
+# How far (characters) before a candidate a label still counts as "near"
+VIN_LABEL_WINDOW = 60
+
+# Common OCR confusions: I, O and Q never appear in a VIN
+_OCR_FIXES = str.maketrans({"O": "0", "Q": "0", "I": "1"})
+
+
+def find_vin_candidates(contract_text: str, stop_early: bool = True):
     """
-    Extract VIN from OCR-extracted contract text
+    Scan the text once for VIN candidates, ranked best first.
+    Each candidate is {"vin", "position", "labeled", "check_digit_valid", "known_wmi"}.
+    A nearby "VIN"/"Chassis" label ranks first (check digits are only mandatory
+    for North American VINs), then a valid check digit, then a known WMI, then
+    position. OCR repairs (O/Q -> 0, I -> 1) are only applied to labeled runs
+    or runs that already contain a digit, so plain words never become VINs.
+    With stop_early, scanning ends at the first labeled candidate with a valid
+    check digit.
     """
+    candidates = []
     if not contract_text:
+        return candidates
+
+    for match in _VIN_CANDIDATE.finditer(contract_text):
+        start = match.start()
+        raw = match.group().upper()
+        labeled = _VIN_LABEL.search(contract_text, max(0, start - VIN_LABEL_WINDOW), start) is not None
+        if not labeled and not any(char.isdigit() for char in raw):
+            continue  # plain words
+
+        vin = raw.translate(_OCR_FIXES)
+        if vin.isdigit() or vin.isalpha():
+            continue  # account/policy numbers and plain words
+
+        candidate = {
+            "vin": vin,
+            "position": start,
+            "labeled": labeled,
+            "check_digit_valid": is_valid_vin(vin),
+            "known_wmi": wmi_table().lookup(vin[:3]) is not None,
+        }
+        candidates.append(candidate)
+        if stop_early and candidate["check_digit_valid"] and candidate["labeled"]:
+            break
+
+    candidates.sort(key=lambda c: (
+        not c["labeled"], not c["check_digit_valid"], not c["known_wmi"], c["position"]
+    ))
+    return candidates
+
+
+def _best_vin_candidate(contract_text: str):
+    """Best candidate if it is labeled or its check digit is valid, else None"""
+    candidates = find_vin_candidates(contract_text)
+    if not candidates:
         return None
+    best = candidates[0]
+    return best if best["labeled"] or best["check_digit_valid"] else None
+
 
-    matches = re.findall(VIN_REGEX, contract_text.upper())
-    return matches[0] if matches else None
+def extract_vin(contract_text: str):
+    """
+    Extract VIN from OCR-extracted contract text
+    """
+    best = _best_vin_candidate(contract_text)
+    return best["vin"] if best else None
 
 
 # =========================
 # VEHICLE DETAILS
 # =========================
 
-def get_vehicle_details(vin: str):
+def _needs_remote(vin, offline):
+    """NHTSA is only asked for VINs that pass the check digit and still have gaps"""
+    return is_valid_vin(vin) and not set(REQUIRED_FIELDS) <= offline.keys()
+
+
+def _decodable(vin, labeled):
+    """A VIN is decoded only if well-formed and either check-digit valid or labeled"""
+    return is_well_formed_vin(vin) and (labeled or is_valid_vin(vin))
+
+
+def get_vehicle_details(vin: str, labeled: bool = False):
     """
-    Fetch vehicle details using NHTSA VIN API
+    Fetch vehicle details: Make, Manufacturer Name and Model Year are decoded
+    locally (vin_decoder); the rest comes from NHTSA (pooled + cached, see vin_service).
+    Returns None for an invalid VIN: malformed, or neither labeled nor check-digit valid.
     """
     if not vin:
         return None
+    vin = vin.upper()
+    if not _decodable(vin, labeled):
+        return None
 
-    url = f"https://vpic.nhtsa.dot.gov/api/vehicles/decodevin/{vin}?format=json"
-    response = requests.get(url, timeout=10)
+    offline = decode_offline(vin)
+    if not _needs_remote(vin, offline):
+        return offline or None
 
-    if response.status_code != 200:
-        return None
+    try:
+        remote = default_service().decode(vin)
+    except (requests.RequestException, ValueError):
+        remote = None
 
-    data = response.json()
+    return {**offline, **(remote or {})} or None
 
-    required_fields = [
-        "Make",
-        "Model",
-        "Model Year",
-        "Body Class",
-        "Fuel Type - Primary",
-        "Manufacturer Name"
-    ]
 
-    vehicle_info = {}
-    for item in data.get("Results", []):
-        if item["Variable"] in required_fields and item["Value"]:
-            vehicle_info[item["Variable"]] = item["Value"]
+def get_vehicle_details_many(vins):
+    """
+    Fetch vehicle details for many VINs with vPIC batch decode. The VINs are
+    supplied by the caller, so they count as labeled; malformed ones map to None.
+    """
+    vins = list(dict.fromkeys(v.upper() for v in vins if v))
+    offline = {vin: decode_offline(vin) for vin in vins if _decodable(vin, labeled=True)}
+
+    remote = {}
+    pending = [vin for vin in offline if _needs_remote(vin, offline[vin])]
+    if pending:
+        try:
+            remote = default_service().decode_many(pending)
+        except (requests.RequestException, ValueError):
+            remote = {}
 
-    return vehicle_info
+    return {
+        vin: ({**offline[vin], **(remote.get(vin) or {})} or None) if vin in offline else None
+        for vin in vins
+    }
 
 
 # =========================
@@ -64,11 +150,13 @@ def extract_vin_and_vehicle_details(contract_text: str):
     """
     Extract VIN and vehicle details from contract text
     """
-    vin = extract_vin(contract_text)
-    vehicle_details = get_vehicle_details(vin)
+    best = _best_vin_candidate(contract_text)
+    vin = best["vin"] if best else None
+    vehicle_details = get_vehicle_details(vin, labeled=best["labeled"]) if best else None
 
     return {
         "vin": vin,
+        "vin_valid": is_valid_vin(vin) if vin else False,
         "vehicle_details": vehicle_details
     }
 
@@ -84,7 +172,7 @@ if __name__ == "__main__":
 
     with open("vehicle_details.json", "w", encoding="utf-8") as f:
         json.dump(result, f, indent=4)
-        
-print('vehicle-details saved')
+
+    print('vehicle-details saved')
 
     
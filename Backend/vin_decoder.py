@@ -0,0 +1,186 @@
+import os
+import csv
+import mmap
+import time
+import threading
+
+# =========================
+# CONFIG
+# =========================
+
+# Human-editable source table; the fixed-width binary table is rebuilt from it
+# whenever the CSV is newer.
+WMI_SOURCE_CSV = os.getenv(
+    "WMI_SOURCE_CSV",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "wmi_table.csv")
+)
+WMI_TABLE_PATH = os.getenv("WMI_TABLE_PATH", os.path.join("runtime_data", "wmi_table.dat"))
+
+# Record layout: WMI (3) + Make (37) + Manufacturer Name (60), space padded ASCII
+_WMI_WIDTH = 3
+_MAKE_WIDTH = 37
+_MANUFACTURER_WIDTH = 60
+RECORD_SIZE = _WMI_WIDTH + _MAKE_WIDTH + _MANUFACTURER_WIDTH
+
+
+# =========================
+# CHECK DIGIT (POSITION 9)
+# =========================
+
+_TRANSLITERATION = {
+    **{str(d): d for d in range(10)},
+    "A": 1, "B": 2, "C": 3, "D": 4, "E": 5, "F": 6, "G": 7, "H": 8,
+    "J": 1, "K": 2, "L": 3, "M": 4, "N": 5, "P": 7, "R": 9,
+    "S": 2, "T": 3, "U": 4, "V": 5, "W": 6, "X": 7, "Y": 8, "Z": 9,
+}
+_WEIGHTS = (8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2)
+
+
+def compute_check_digit(vin: str):
+    """Expected position-9 character for a 17-character VIN (None if malformed)"""
+    if len(vin) != 17:
+        return None
+    total = 0
+    for char, weight in zip(vin.upper(), _WEIGHTS):
+        value = _TRANSLITERATION.get(char)
+        if value is None:
+            return None
+        total += value * weight
+    remainder = total % 11
+    return "X" if remainder == 10 else str(remainder)
+
+
+def is_well_formed_vin(vin: str) -> bool:
+    """True if the VIN is 17 characters of digits and letters other than I, O, Q"""
+    return bool(vin) and len(vin) == 17 and all(char in _TRANSLITERATION for char in vin.upper())
+
+
+def is_valid_vin(vin: str) -> bool:
+    """True if the VIN is well-formed and its check digit matches"""
+    return bool(vin) and compute_check_digit(vin) == vin[8].upper()
+
+
+def with_check_digit(vin: str) -> str:
+    """Return the VIN with position 9 set to its correct check digit"""
+    vin = vin.upper()
+    return vin[:8] + compute_check_digit(vin) + vin[9:]
+
+
+# =========================
+# MODEL YEAR (POSITION 10)
+# =========================
+
+_YEAR_CODES = "ABCDEFGHJKLMNPRSTVWXY123456789"
+
+
+def decode_model_year(vin: str):
+    """
+    Model year from position 10. The code repeats every 30 years, so take the
+    most recent year of the cycle that is not after next year (financed
+    vehicles are recent; the position-7 rule only holds for North America).
+    """
+    if len(vin) != 17:
+        return None
+    index = _YEAR_CODES.find(vin[9].upper())
+    if index < 0:
+        return None
+
+    latest = time.localtime().tm_year + 1
+    year = 1980 + index
+    year += (latest - year) // 30 * 30
+    return year
+
+
+# =========================
+# WMI TABLE (MEMORY-MAPPED)
+# =========================
+
+def build_wmi_table(source=WMI_SOURCE_CSV, target=WMI_TABLE_PATH):
+    """Compile the WMI CSV into a sorted fixed-width table for binary search"""
+    with open(source, "r", encoding="utf-8", newline="") as f:
+        rows = sorted(
+            (row["wmi"].strip().upper(), row["make"].strip(), row["manufacturer"].strip())
+            for row in csv.DictReader(f)
+        )
+
+    if os.path.dirname(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        for wmi, make, manufacturer in rows:
+            f.write(
+                wmi.encode("ascii").ljust(_WMI_WIDTH)[:_WMI_WIDTH]
+                + make.encode("ascii").ljust(_MAKE_WIDTH)[:_MAKE_WIDTH]
+                + manufacturer.encode("ascii").ljust(_MANUFACTURER_WIDTH)[:_MANUFACTURER_WIDTH]
+            )
+    os.replace(tmp_path, target)
+
+
+class WMITable:
+    """Read-only WMI -> (Make, Manufacturer Name) lookups over an mmap'd table"""
+
+    def __init__(self, path=WMI_TABLE_PATH, source=WMI_SOURCE_CSV):
+        if not os.path.exists(path) or (
+            os.path.exists(source) and os.path.getmtime(source) > os.path.getmtime(path)
+        ):
+            build_wmi_table(source, path)
+
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else b""
+        self._count = len(self._data) // RECORD_SIZE
+
+    def __len__(self):
+        return self._count
+
+    def lookup(self, wmi: str):
+        key = wmi.upper().encode("ascii", "replace")
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            offset = mid * RECORD_SIZE
+            current = self._data[offset:offset + _WMI_WIDTH]
+            if current < key:
+                low = mid + 1
+            elif current > key:
+                high = mid
+            else:
+                offset += _WMI_WIDTH
+                make = self._data[offset:offset + _MAKE_WIDTH]
+                manufacturer = self._data[offset + _MAKE_WIDTH:offset + _MAKE_WIDTH + _MANUFACTURER_WIDTH]
+                return make.decode("ascii").rstrip(), manufacturer.decode("ascii").rstrip()
+        return None
+
+
+_wmi_table = None
+_wmi_lock = threading.Lock()
+
+
+def wmi_table() -> WMITable:
+    global _wmi_table
+    with _wmi_lock:
+        if _wmi_table is None:
+            _wmi_table = WMITable()
+        return _wmi_table
+
+
+# =========================
+# OFFLINE DECODE
+# =========================
+
+def decode_offline(vin: str):
+    """
+    Fields that can be read straight off the VIN, no network call:
+    Make and Manufacturer Name (WMI) and Model Year (position 10).
+    """
+    if not vin or len(vin) != 17:
+        return {}
+
+    details = {}
+    found = wmi_table().lookup(vin[:3])
+    if found:
+        details["Make"], details["Manufacturer Name"] = found
+
+    year = decode_model_year(vin)
+    if year:
+        details["Model Year"] = str(year)
+    return details
@@ -0,0 +1,232 @@
+import os
+import json
+import sqlite3
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# =========================
+# CONFIG
+# =========================
+
+VPIC_BASE_URL = os.getenv("VPIC_BASE_URL", "https://vpic.nhtsa.dot.gov/api/vehicles")
+VIN_CACHE_PATH = os.getenv("VIN_CACHE_PATH", os.path.join("runtime_data", "vin_cache.sqlite3"))
+VIN_POOL_SIZE = int(os.getenv("VIN_POOL_SIZE", 16))
+VIN_TIMEOUT = 10
+
+# vPIC accepts up to 50 VINs per batch decode call
+VPIC_BATCH_SIZE = 50
+
+REQUIRED_FIELDS = [
+    "Make",
+    "Model",
+    "Model Year",
+    "Body Class",
+    "Fuel Type - Primary",
+    "Manufacturer Name"
+]
+
+# DecodeVINValuesBatch returns flat keys instead of "Variable" names
+BATCH_FIELD_NAMES = {
+    "Make": "Make",
+    "Model": "Model",
+    "ModelYear": "Model Year",
+    "BodyClass": "Body Class",
+    "FuelTypePrimary": "Fuel Type - Primary",
+    "Manufacturer": "Manufacturer Name",
+}
+
+
+# =========================
+# VIN SERVICE
+# =========================
+
+class VinService:
+    """
+    NHTSA vPIC client with a pooled HTTP session and a persistent SQLite cache.
+    A decoded VIN never changes, so cache entries never expire; an empty or
+    failed decode (unknown or mistyped VIN, vPIC hiccup, non-JSON reply) is
+    not cached.
+    """
+
+    def __init__(self, base_url=VPIC_BASE_URL, cache_path=VIN_CACHE_PATH, pool_size=VIN_POOL_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.remote_calls = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                              allowed_methods=None)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        if os.path.dirname(cache_path):
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        self._db = sqlite3.connect(cache_path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS vins (vin TEXT PRIMARY KEY, details TEXT NOT NULL)")
+        self._db.commit()
+
+    # ---------- cache ----------
+
+    def _cached(self, vins):
+        found = {}
+        with self._lock:
+            for vin in vins:
+                row = self._db.execute("SELECT details FROM vins WHERE vin = ?", (vin,)).fetchone()
+                if row:
+                    found[vin] = json.loads(row[0])
+            self.cache_hits += len(found)
+            self.cache_misses += len(vins) - len(found)
+        return found
+
+    def _store(self, decoded):
+        rows = [(vin, json.dumps(details)) for vin, details in decoded.items() if details]
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO vins (vin, details) VALUES (?, ?)", rows)
+            self._db.commit()
+
+    # ---------- remote ----------
+
+    def _count_remote_call(self):
+        with self._lock:
+            self.remote_calls += 1
+
+    def _fetch_one(self, vin):
+        self._count_remote_call()
+        response = self.session.get(
+            f"{self.base_url}/decodevin/{vin}", params={"format": "json"}, timeout=VIN_TIMEOUT
+        )
+        if response.status_code != 200:
+            return None
+        try:
+            results = response.json().get("Results", [])
+        except ValueError:  # vPIC can answer 200 with an HTML error page
+            return None
+
+        vehicle_info = {}
+        for item in results:
+            if item["Variable"] in REQUIRED_FIELDS and item["Value"]:
+                vehicle_info[item["Variable"]] = item["Value"]
+        return vehicle_info
+
+    def _fetch_batch(self, vins):
+        self._count_remote_call()
+        response = self.session.post(
+            f"{self.base_url}/DecodeVINValuesBatch/",
+            data={"DATA": ";".join(vins), "format": "json"},
+            timeout=VIN_TIMEOUT
+        )
+        if response.status_code != 200:
+            return {}
+        try:
+            results = response.json().get("Results", [])
+        except ValueError:
+            return {}
+
+        decoded = {}
+        for row in results:
+            vin = (row.get("VIN") or "").upper()
+            decoded[vin] = {
+                name: row[key] for key, name in BATCH_FIELD_NAMES.items() if row.get(key)
+            }
+        return decoded
+
+    # ---------- public ----------
+
+    def decode(self, vin: str):
+        """Vehicle details for one VIN (None if the lookup failed)"""
+        if not vin:
+            return None
+        vin = vin.upper()
+
+        cached = self._cached([vin])
+        if vin in cached:
+            return cached[vin]
+
+        vehicle_info = self._fetch_one(vin)
+        self._store({vin: vehicle_info})
+        return vehicle_info
+
+    def decode_many(self, vins):
+        """Vehicle details for many VINs, using vPIC batch decode for cache misses"""
+        vins = list(dict.fromkeys(v.upper() for v in vins if v))
+        results = self._cached(vins)
+
+        missing = [vin for vin in vins if vin not in results]
+        for i in range(0, len(missing), VPIC_BATCH_SIZE):
+            decoded = self._fetch_batch(missing[i:i + VPIC_BATCH_SIZE])
+            self._store(decoded)
+            results.update(decoded)
+
+        return {vin: results.get(vin) for vin in vins}
+
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM vins").fetchone()[0]
+        return {
+            "cached_vins": entries,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "remote_calls": self.remote_calls
+        }
+
+
+_default_service = None
+_default_lock = threading.Lock()
+
+
+def default_service() -> VinService:
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            _default_service = VinService()
+        return _default_service
+
+
+# =========================
+# BENCHMARK (AGAINST LOCAL MOCK vPIC)
+# =========================
+
+if __name__ == "__main__":
+    import time
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+    from mock_vpic import start_mock_vpic, sample_vins
+
+    server, base_url = start_mock_vpic(latency=0.05)
+    vins = sample_vins(200)
+
+    def timed(label, func):
+        start = time.perf_counter()
+        func()
+        print(f"{label:<36} {time.perf_counter() - start:6.2f}s")
+
+    def unpooled():
+        # Previous behaviour: a fresh connection per VIN
+        def one(vin):
+            requests.get(f"{base_url}/decodevin/{vin}?format=json", timeout=VIN_TIMEOUT)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(one, vins))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pooled = VinService(base_url, os.path.join(tmp, "a.sqlite3"))
+        batched = VinService(base_url, os.path.join(tmp, "b.sqlite3"))
+
+        print(f"{len(vins)} VINs, 50ms simulated vPIC latency")
+        timed("unpooled requests.get x8 threads", unpooled)
+        timed("pooled session x8 threads", lambda: list(ThreadPoolExecutor(8).map(pooled.decode, vins)))
+        timed("batch decode (50 per call)", lambda: batched.decode_many(vins))
+        timed("persistent cache (all hits)", lambda: batched.decode_many(vins))
+        print("batched stats:", batched.stats())
+
+    server.shutdown()
@@ -6,6 +6,12 @@ import 'dart:typed_data';
 const String API_URL = 'http://127.0.0.1:8000'; // URL
 
 class ApiService {
+  // Document id returned by /ocr, used by /analyze
+  static String? _documentId;
+
+  // Conversations whose contract context the server already holds
+  static final Set<String> _dealerSessions = {};
+
   // Step 1: Upload file to /ocr
   static Future<String> uploadFile(Uint8List bytes, String filename) async {
     try {
@@ -18,6 +24,7 @@ class ApiService {
       if (response.statusCode == 200) {
         var responseBody = await response.stream.bytesToString();
         var jsonResponse = json.decode(responseBody);
+        _documentId = jsonResponse['document_id'];
         return jsonResponse['ocr_text'] ?? '';
       }
       throw Exception('Upload failed: ${response.statusCode}');
@@ -26,12 +33,16 @@ class ApiService {
     }
   }
 
-  // Step 2: Analyze contract from /analyze (GET, no parameters)
+  // Step 2: Analyze contract from /analyze (GET, document id from /ocr)
   static Future<Map<String, dynamic>> analyzeContract(String text, String vin) async {
     try {
-      // Your backend /analyze is GET with no input - it reads from saved file
+      if (_documentId == null) {
+        throw Exception('Upload a contract first');
+      }
       final response = await http.get(
-        Uri.parse('$API_URL/analyze'),
+        Uri.parse('$API_URL/analyze').replace(
+          queryParameters: {'document_id': _documentId},
+        ),
       );
 
       if (response.statusCode == 200) {
@@ -43,6 +54,45 @@ class ApiService {
     }
   }
 
+  /// Stream a reply from one of the /stream endpoints (server-sent events):
+  /// yields text chunks as they arrive; stops at the 'done' event
+  static Stream<String> streamText(String path, Map<String, dynamic> body) async* {
+    final client = http.Client();
+    try {
+      final request = http.Request('POST', Uri.parse('$API_URL$path'))
+        ..headers['Content-Type'] = 'application/json'
+        ..body = json.encode(body);
+      final response = await client.send(request);
+      if (response.statusCode != 200) {
+        throw Exception('Stream failed: ${response.statusCode}');
+      }
+
+      String event = '';
+      await for (final line in response.stream
+          .transform(utf8.decoder)
+          .transform(const LineSplitter())) {
+        if (line.startsWith('event: ')) {
+          event = line.substring(7);
+        } else if (line.startsWith('data: ')) {
+          if (event == 'done') break;
+          if (event == 'token') {
+            yield json.decode(line.substring(6))['text'] ?? '';
+          }
+        }
+      }
+    } finally {
+      client.close();
+    }
+  }
+
+  /// Chatbot reply streamed token by token (see streamText)
+  static Stream<String> streamChatbotResponse(String userMessage, String contractContext) {
+    return streamText('/chat/stream', {
+      'user_message': userMessage,
+      'contract_context': contractContext,
+    });
+  }
+
   static Future<String> getChatbotResponse(String userMessage, String contractContext) async {
     try {
       final response = await http.post(
@@ -123,6 +173,32 @@ class ApiService {
         "Ask me anything specific about your contract!";
   }
 
+  /// EMI grid for what-if sliders: emi[down][term][apr], fetched once
+  static Future<Map<String, dynamic>> getEmiGrid({
+    int? price,
+    String? make,
+    int? year,
+  }) async {
+    try {
+      final response = await http.post(
+        Uri.parse('$API_URL/api/emi-grid'),
+        headers: {'Content-Type': 'application/json'},
+        body: json.encode({
+          if (price != null) 'price': price,
+          if (make != null) 'make': make,
+          if (year != null) 'year': year,
+        }),
+      ).timeout(const Duration(seconds: 10));
+
+      if (response.statusCode == 200) {
+        return json.decode(response.body);
+      }
+      throw Exception('EMI grid failed: ${response.statusCode}');
+    } catch (e) {
+      throw Exception('EMI grid error: $e');
+    }
+  }
+
   // ADD THESE TO YOUR EXISTING api_service.dart
 
 /// Send message to dealer (simulated backend)
@@ -133,19 +209,34 @@ class ApiService {
     required Map<String, dynamic> negotiationContext,
   }) async {
     try {
-      final response = await http.post(
+      // The server keeps the contract context per conversation; send it only
+      // until the server confirms it has it
+      Future<http.Response> post(bool sendContract) => http.post(
         Uri.parse('$API_URL/dealer/message'),
         headers: {'Content-Type': 'application/json'},
         body: json.encode({
           'conversation_id': conversationId,
           'user_message': userMessage,
-          'contract_context': contractContext,
+          if (sendContract) 'contract_context': contractContext,
           'negotiation_context': negotiationContext,
         }),
       ).timeout(const Duration(seconds: 15));
 
+      var response = await post(!_dealerSessions.contains(conversationId));
+
+      // 409: the server's session expired; resend the full context once
+      if (response.statusCode == 409) {
+        _dealerSessions.remove(conversationId);
+        response = await post(true);
+      }
+
       if (response.statusCode == 200) {
         var jsonResponse = json.decode(response.body);
+        if (jsonResponse['has_contract_context'] == true) {
+          _dealerSessions.add(conversationId);
+        } else {
+          _dealerSessions.remove(conversationId);
+        }
         return jsonResponse['dealer_response'] ?? 'No response';
       }
       throw Exception('Dealer response failed: ${response.statusCode}');